@@ -0,0 +1,221 @@
+import os
+import time
+import asyncio
+import threading
+from typing import List, Set
+
+import httpx
+from openai import AsyncOpenAI
+
+import llm_cache
+import llm_guard
+import ats_engine
+import resume_chunking
+from models import ATSEvaluation, ExperienceItem, ResumeData
+from backend_ai import (
+    ResumeAgentBase, OPENROUTER_BASE_URL, PARSE_CHAR_BUDGET, dedupe_action_verbs, _first_word,
+)
+
+# --- CONNECTION LIMITS (process-wide) ---
+MAX_CONNECTIONS = int(os.getenv("RESUMEAI_MAX_CONNECTIONS", "100"))
+MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("RESUMEAI_MAX_KEEPALIVE", "20"))
+MAX_IN_FLIGHT = int(os.getenv("RESUMEAI_MAX_IN_FLIGHT", "32"))
+REQUEST_TIMEOUT = llm_guard.REQUEST_TIMEOUT
+
+# --- SHARED RUNTIME ---
+class AsyncRuntime:
+    """
+    One event loop thread and one keep-alive AsyncOpenAI client for the whole process.
+    Every request runs on this loop, so the connection pool is never touched from another loop
+    (Streamlit script threads, asyncio.run() in scripts, ...).
+    """
+
+    def __init__(self, api_key: str, max_connections: int = MAX_CONNECTIONS,
+                 max_keepalive_connections: int = MAX_KEEPALIVE_CONNECTIONS,
+                 max_in_flight: int = MAX_IN_FLIGHT, timeout: float = REQUEST_TIMEOUT):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="resumeai-async", daemon=True)
+        self._thread.start()
+        self.client = AsyncOpenAI(
+            base_url=OPENROUTER_BASE_URL,
+            api_key=api_key,
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_keepalive_connections,
+                ),
+                timeout=timeout,
+            ),
+            max_retries=0,  # retries, backoff and rate limiting live in llm_guard
+        )
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+
+    async def _complete(self, **kwargs):
+        async with self._in_flight:
+            return await self.client.chat.completions.create(**kwargs)
+
+    async def complete(self, **kwargs):
+        """Runs a chat completion on the runtime loop, awaitable from any loop."""
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self.loop:
+            return await self._complete(**kwargs)
+        future = asyncio.run_coroutine_threadsafe(self._complete(**kwargs), self.loop)
+        return await asyncio.wrap_future(future)
+
+    def run(self, coro, timeout=None):
+        """Blocks the calling (non-async) thread until `coro` finishes on the runtime loop."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(timeout)
+
+
+_runtime = None
+_runtime_lock = threading.Lock()
+
+def get_runtime() -> AsyncRuntime:
+    global _runtime
+    with _runtime_lock:
+        if _runtime is None:
+            api_key = os.getenv("OPENROUTER_API_KEY")
+            if not api_key:
+                raise ValueError("OPENROUTER_API_KEY missing")
+            _runtime = AsyncRuntime(api_key)
+        return _runtime
+
+# --- ASYNC AGENT ---
+class AsyncResumeAgent(ResumeAgentBase):
+    """
+    Async counterpart of ResumeAgent with the same public methods. All instances share the
+    process-wide AsyncRuntime. From synchronous code use `agent.run(agent.audit_resume(...))`.
+    """
+
+    def __init__(self, cache=None, runtime: AsyncRuntime = None, router=None, jd_library_store=None):
+        self.runtime = runtime if runtime is not None else get_runtime()
+        super().__init__(cache=cache, router=router, jd_library_store=jd_library_store)
+
+    def run(self, coro, timeout=None):
+        return self.runtime.run(coro, timeout)
+
+    async def _call_llm(self, system_prompt: str, user_prompt: str, response_format=None, task: str = None, validate=None):
+        if response_format is None:
+            response_format = {"type": "json_object"}
+        fallback = None
+        for model in self.models_for(task):
+            cache_key = llm_cache.make_cache_key(model, system_prompt, user_prompt, response_format)
+            # SQLite tiers (cache, JD library) block, so they run on worker threads, never on the shared loop
+            cached = await asyncio.to_thread(self.cache.get, cache_key)
+            if cached is not None and (validate is None or validate(cached)):
+                return cached
+            content = await llm_cache.get_single_flight().do_async(
+                cache_key, lambda: self._fetch_llm(model, task, cache_key, system_prompt, user_prompt, response_format, validate)
+            )
+            if content and (validate is None or validate(content)):
+                return content
+            fallback = fallback or content
+        return fallback
+
+    async def _fetch_llm(self, model: str, task: str, cache_key: str, system_prompt: str, user_prompt: str, response_format,
+                         validate=None):
+        start = time.perf_counter()
+        try:
+            completion = await llm_guard.acall_with_retry(lambda: self.runtime.complete(
+                model=model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt},
+                ],
+                response_format=response_format,
+                timeout=REQUEST_TIMEOUT
+            ), llm_guard.estimate_tokens(system_prompt, user_prompt))
+            content = completion.choices[0].message.content
+        except Exception as e:
+            print(f"API Error ({model}): {e}")
+            self.router.record(task, model, time.perf_counter() - start, ok=False)
+            return None
+        valid = bool(content) and (validate is None or validate(content))
+        self.router.record(task, model, time.perf_counter() - start, getattr(completion, "usage", None), ok=valid)
+        if valid:
+            await asyncio.to_thread(self.cache.set, cache_key, content)
+        return content
+
+    async def parse_resume_text(self, raw_text: str, use_local: bool = True) -> ResumeData:
+        if not use_local:
+            return await self._parse_with_llm(raw_text)
+        local, fields = self._local_parse(raw_text)
+        if not fields:
+            return local.data
+        parsed = await self._parse_with_llm(local.text_for(fields), fields)
+        return local.merged_with(parsed, fields)
+
+    async def _parse_with_llm(self, raw_text: str, fields: List[str] = None) -> ResumeData:
+        if len(raw_text) <= PARSE_CHAR_BUDGET:
+            response = await self._call_llm(*self._parse_prompts(raw_text, fields=fields), task="parse",
+                                            validate=self._is_resume_reply)
+            return self._parse_resume_response(response)
+
+        chunks = self._parse_chunks(raw_text)
+        responses = await asyncio.gather(
+            *(self._call_llm(*self._parse_prompts(chunk, part=(i + 1, len(chunks)), fields=fields), task="parse",
+                             validate=self._is_resume_reply)
+              for i, chunk in enumerate(chunks))
+        )
+        return resume_chunking.merge_resume_parts([self._parse_resume_response(r) for r in responses])
+
+    async def audit_resume(self, resume_data: ResumeData, jd_text: str, mode: str = "hybrid") -> ATSEvaluation:
+        if not jd_text:
+            return ATSEvaluation(score=100, missing_keywords=[], suggestions=["No JD provided for comparison."])
+        if mode == "llm":
+            prompts = await asyncio.to_thread(self._audit_prompts, resume_data, jd_text)
+            response_text = await self._call_llm(*prompts, task="audit", validate=self._is_audit_reply)
+            return self._audit_response(response_text)
+
+        entry = await asyncio.to_thread(self.jd_library.get, jd_text)
+        evaluation = ats_engine.score_resume(resume_data, jd_text, profile=entry.profile)
+        if mode == "local":
+            return evaluation
+        prompts = await asyncio.to_thread(self._suggestion_prompts, resume_data, jd_text, evaluation)
+        response_text = await self._call_llm(*prompts, task="audit", validate=self._is_suggestions_reply)
+        return self._with_suggestions(evaluation, response_text)
+
+    async def generate_cover_letter(self, resume_data: ResumeData, jd_text: str) -> str:
+        prompts = await asyncio.to_thread(self._cover_letter_prompts, resume_data, jd_text)
+        response = await self._call_llm(*prompts, task="cover_letter")
+        return self._cover_letter_response(response)
+
+    async def _rewrite_job(self, job: ExperienceItem, target_role: str, jd_context: str, tone: str, forbidden_verbs: Set[str]) -> List[str]:
+        system_prompt, user_prompt = self._rewrite_prompts(job, target_role, jd_context, tone, forbidden_verbs)
+        response_text = await self._call_llm(system_prompt, user_prompt, task="rewrite",
+                                             validate=lambda reply: self._is_bullets_reply(reply, job))
+        return self._parse_bullets(response_text, job)
+
+    async def rewrite_all_jobs(self, jobs: List[ExperienceItem], target_role: str, jd_text: str = "", tone: str = "Standard",
+                               concurrent: bool = True) -> List[ExperienceItem]:
+        """
+        Same contract as ResumeAgent.rewrite_all_jobs. Concurrent by default; parallelism is bounded
+        by the runtime's in-flight limit rather than a per-call pool.
+        """
+        jd_context = await asyncio.to_thread(self._jd_context, jd_text)
+        stale = {id(job): fingerprint for job, fingerprint in self._stale_jobs(jobs, target_role, jd_text, tone)}
+
+        if concurrent:
+            changed = [job for job in jobs if id(job) in stale]
+            results = await asyncio.gather(
+                *(self._rewrite_job(job, target_role, jd_context, tone, set()) for job in changed)
+            )
+            for job, new_bullets in zip(changed, results):
+                self._store_rewrite(job, new_bullets, stale[id(job)])
+            dedupe_action_verbs(jobs, keep=[job for job in jobs if id(job) not in stale])
+            return list(jobs)
+
+        used_verbs: Set[str] = {_first_word(b) for job in jobs if id(job) not in stale for b in job.enhanced_bullets} - {""}
+        for job in jobs:
+            if id(job) not in stale:
+                continue
+            new_bullets = await self._rewrite_job(job, target_role, jd_context, tone, used_verbs)
+            for bullet in new_bullets:
+                verb = _first_word(bullet)
+                if verb:
+                    used_verbs.add(verb)
+            self._store_rewrite(job, new_bullets, stale[id(job)])
+        return list(jobs)
@@ -0,0 +1,343 @@
+import math
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+import numpy as np
+from pydantic import BaseModel, Field
+
+from models import ATSEvaluation, ResumeData
+
+# --- VOCABULARY ---
+STOPWORDS = {
+    "a", "about", "above", "across", "after", "all", "also", "am", "an", "and", "any", "are", "as", "at",
+    "be", "been", "being", "both", "but", "by", "can", "could", "do", "does", "each", "etc", "for", "from",
+    "had", "has", "have", "he", "her", "his", "how", "i", "if", "in", "into", "is", "it", "its", "may",
+    "me", "more", "most", "must", "my", "no", "not", "of", "on", "one", "or", "other", "our", "out", "over",
+    "per", "plus", "she", "should", "so", "some", "such", "than", "that", "the", "their", "them", "then",
+    "there", "these", "they", "this", "those", "through", "to", "under", "up", "us", "via", "was", "we",
+    "were", "what", "when", "where", "which", "while", "who", "will", "with", "within", "would", "you", "your",
+}
+
+# Words every posting uses; they say nothing about fit.
+GENERIC_TERMS = {
+    "ability", "able", "candidate", "company", "environment", "excellent", "experience", "experienced",
+    "familiarity", "good", "great", "help", "ideal", "including", "job", "knowledge", "like", "looking",
+    "new", "opportunity", "plus", "position", "preferred", "proficiency", "proficient", "qualification",
+    "related", "required", "requirement", "responsibility", "responsible", "role", "skill", "strong",
+    "team", "understanding", "using", "work", "working", "year", "join", "day", "make", "well", "best",
+    "high", "level", "based", "ensure", "world", "benefit", "build", "basis", "celebrate", "collaborate",
+    "color", "competitive", "conduct", "employee", "employer", "apply", "applicant", "offer",
+    "religion", "national", "origin", "status", "regard", "equal", "applicable", "protected",
+}
+
+# Canonical spellings for common variants.
+ALIASES = {
+    "js": "javascript", "ts": "typescript", "k8s": "kubernetes", "postgres": "postgresql",
+    "golang": "go", "reactjs": "react", "react.js": "react", "nodejs": "node.js", "node": "node.js",
+    "sklearn": "scikit-learn", "tf": "tensorflow", "gcloud": "gcp", "py": "python", "apis": "api",
+}
+
+KNOWN_SKILLS = {
+    "python", "java", "javascript", "typescript", "go", "rust", "c", "c++", "c#", "ruby", "php", "scala",
+    "kotlin", "swift", "r", "matlab", "sql", "nosql", "bash", "html", "css", "react", "angular", "vue",
+    "next.js", "node.js", "express", "django", "flask", "fastapi", "spring", "spring boot", "rails",
+    "graphql", "rest", "rest api", "grpc", "microservices", "aws", "azure", "gcp", "docker", "kubernetes",
+    "terraform", "ansible", "jenkins", "github actions", "ci/cd", "git", "linux", "postgresql", "mysql",
+    "mongodb", "redis", "elasticsearch", "kafka", "rabbitmq", "spark", "hadoop", "airflow", "dbt",
+    "snowflake", "bigquery", "databricks", "etl", "data pipeline", "data warehouse", "data analysis",
+    "data modeling", "machine learning", "deep learning", "nlp", "computer vision", "llm", "pytorch",
+    "tensorflow", "scikit-learn", "pandas", "numpy", "statistics", "a/b testing", "tableau", "power bi",
+    "excel", "looker", "agile", "scrum", "kanban", "jira", "figma", "product management",
+    "project management", "stakeholder management", "system design", "distributed systems",
+    "unit testing", "test automation", "selenium", "cypress", "security", "oauth", "observability",
+    "prometheus", "grafana", "serverless", "lambda", "s3", "ec2", "devops", "sre", "mlops", "api",
+}
+
+_TOKEN_RE = re.compile(r"[a-z0-9+#][a-z0-9+#./\-]*")
+MAX_NGRAM = 3
+
+# --- JD BOILERPLATE ---
+# Section headings (whole line) whose section is dropped, and sentences dropped wherever they appear
+BOILERPLATE_HEADINGS = re.compile(
+    r"^\W*(benefits( (and|&) perks)?|perks( (and|&) benefits)?|what we offer|about us|about the (company|team)|"
+    r"who we are|our (mission|culture|values)|why join( us| [\w.&-]+)?|why work (here|with us)|life at [\w.&-]+|"
+    r"equal (employment )?opportunity( employer)?|eeo( statement)?|diversity( (and|&) inclusion)?|accommodations?|"
+    r"compensation( (and|&) benefits)?|salary( range)?|pay range|how to apply|privacy (notice|policy))\W*$", re.I)
+BOILERPLATE_SENTENCES = re.compile(
+    r"(equal opportunity|without regard to|race, color|sexual orientation|gender identity|veteran status|"
+    r"reasonable accommodation|e-?verify|background check|401\s?\(?k\)?|\bdental\b|vision insurance|"
+    r"paid time off|\bpto\b|parental leave|stock options|competitive salary|salary range|pay range|"
+    r"we are proud|we're proud|\bwe offer\b|click apply|apply now|recruitment agencies)", re.I)
+REQUIREMENT_HEADINGS = re.compile(
+    r"\b(requirements|qualifications|responsibilities|what you('ll| will) do|what you bring|you have|you will|"
+    r"must have|nice to have|preferred|skills|experience|the role|duties)\b", re.I)
+_BULLET_RE = re.compile(r"^\s*(?:[-*•●▪◦]|\d+[.)])\s*")
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+(?=[A-Z])")
+
+# --- TOKENIZATION ---
+@lru_cache(maxsize=65536)
+def normalize_token(token: str) -> str:
+    token = token.strip(".-/")
+    token = ALIASES.get(token, token)
+    # Light plural folding; leave symbol-bearing tech tokens (node.js, ci/cd) and short words alone
+    if (len(token) > 3 and token.endswith("s") and not token.endswith(("ss", "is", "us"))
+            and token.isalpha() and token not in KNOWN_SKILLS and token not in STOPWORDS):
+        token = token[:-3] + "y" if token.endswith("ies") else token[:-1]
+    return token
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in map(normalize_token, _TOKEN_RE.findall(text.lower())) if token]
+
+# Multi-word skills in tokenized form, since plural folding turns "distributed systems" into "distributed system"
+KNOWN_SKILLS = {" ".join(tokenize(skill)) for skill in KNOWN_SKILLS}
+
+def _is_content(token: str) -> bool:
+    return (token not in STOPWORDS and token not in GENERIC_TERMS
+            and (token in KNOWN_SKILLS or (len(token) > 2 and not token[0].isdigit())))
+
+def ngrams(tokens: List[str], max_n: int = MAX_NGRAM):
+    for n in range(1, max_n + 1):
+        for i in range(len(tokens) - n + 1):
+            yield " ".join(tokens[i:i + n])
+
+def _is_heading(line: str) -> bool:
+    stripped = line.strip()
+    return bool(stripped) and len(stripped) < 60 and (stripped.endswith(":") or stripped.isupper() or
+                                                      (len(stripped.split()) <= 5 and not stripped.endswith(".")))
+
+
+def _is_section_title(line: str) -> bool:
+    # "Privacy and Compliance", "## Security", "TOOLING": marks a new section even without a colon
+    stripped = line.strip()
+    words = [word for word in stripped.strip("#*_ ").split() if len(word) > 3]
+    return stripped.startswith(("#", "**")) or stripped.isupper() or (bool(words) and all(w[0].isupper() for w in words))
+
+
+def _mentions_skill(text: str) -> bool:
+    # One- and two-letter skills (C, R, Go) are too ambiguous in prose to rescue a line
+    return any(len(term) > 2 and term in KNOWN_SKILLS for term in ngrams(tokenize(text)))
+
+
+def jd_sentences(jd_text: str) -> List[str]:
+    """
+    Sentences/bullets of a JD outside boilerplate sections (benefits, EEO, company blurb), minus boilerplate
+    sentences. Bullets naming a known skill are kept even inside a boilerplate section.
+    """
+    kept = []
+    skipping = False
+    for line in jd_text.splitlines():
+        if not line.strip():
+            continue
+        bulleted = bool(_BULLET_RE.match(line))
+        if _is_heading(line) and not bulleted:
+            if BOILERPLATE_HEADINGS.match(line) and not REQUIREMENT_HEADINGS.search(line):
+                skipping = True
+                continue
+            if REQUIREMENT_HEADINGS.search(line) or line.strip().endswith(":"):
+                skipping = False
+                continue
+            if skipping and _is_section_title(line):
+                skipping = False
+        if skipping and not (bulleted and _mentions_skill(line)):
+            continue
+        for sentence in _SENTENCE_SPLIT_RE.split(_BULLET_RE.sub("", line).strip()):
+            sentence = sentence.strip()
+            if sentence and not BOILERPLATE_SENTENCES.search(sentence):
+                kept.append(sentence)
+    return kept
+
+# --- JD PROFILE ---
+class JDProfile(BaseModel):
+    """Weighted key terms of one job description. `skills` lists recognised skill phrases, best first."""
+    terms: Dict[str, float] = Field(default_factory=dict)
+    skills: List[str] = Field(default_factory=list)
+
+
+def is_keyword(term: str) -> bool:
+    """Known skills and multi-word phrases; single plain words weigh in the score but are never reported as missing."""
+    return term in KNOWN_SKILLS or " " in term
+
+
+def extract_jd_terms(jd_text: str) -> Counter:
+    """
+    Counts candidate key phrases in a JD: known skills (1-3 words), content words, and repeated bigrams.
+    Boilerplate (benefits, EEO statements, company blurb) is stripped first.
+    """
+    tokens = tokenize("\n".join(jd_sentences(jd_text)) or jd_text)
+    counts = Counter()
+    bigrams = Counter()
+    for i, token in enumerate(tokens):
+        if _is_content(token):
+            counts[token] += 1
+        for n in (2, 3):
+            if i + n <= len(tokens):
+                phrase = " ".join(tokens[i:i + n])
+                if phrase in KNOWN_SKILLS:
+                    counts[phrase] += 1
+                elif n == 2 and _is_content(tokens[i]) and _is_content(tokens[i + 1]):
+                    bigrams[phrase] += 1
+    for phrase, tf in bigrams.items():
+        if tf >= 2:
+            counts[phrase] += tf
+    return counts
+
+
+def bm25_idf(df: int, n_docs: int) -> float:
+    return math.log((n_docs - df + 0.5) / (df + 0.5) + 1.0)
+
+
+def build_jd_profile(jd_text: str, doc_freq: Optional[Dict[str, int]] = None, n_docs: int = 0,
+                     k1: float = 1.2, max_terms: int = 60) -> JDProfile:
+    """
+    Weights JD terms with a BM25-saturated term frequency, times IDF when corpus statistics
+    (`doc_freq` over `n_docs` documents) are available. Known skills get a boost.
+    """
+    counts = extract_jd_terms(jd_text)
+    weights = {}
+    for term, tf in counts.items():
+        weight = tf * (k1 + 1) / (tf + k1)
+        if doc_freq and n_docs:
+            weight *= bm25_idf(doc_freq.get(term, 0), n_docs)
+        if term in KNOWN_SKILLS:
+            weight *= 2.0
+        weights[term] = weight
+    top = sorted(weights.items(), key=lambda kv: (-kv[1], kv[0]))[:max_terms]
+    return JDProfile(
+        terms=dict(top),
+        skills=[term for term, _ in top if term in KNOWN_SKILLS],
+    )
+
+
+@lru_cache(maxsize=256)
+def get_jd_profile(jd_text: str) -> JDProfile:
+    """Memoized build_jd_profile without corpus statistics. Treat the result as read-only."""
+    return build_jd_profile(jd_text)
+
+# --- RESUME SIDE ---
+def resume_text(resume_data: ResumeData) -> str:
+    """Everything the scorer can match against: skills, roles, stacks, bullets and raw summaries."""
+    parts = []
+    for category, items in resume_data.skills.items():
+        parts.append(f"{category}: {items}")
+    for job in resume_data.experience:
+        parts.extend([job.role, job.tech_stack, job.summary_input])
+        parts.extend(job.enhanced_bullets)
+    return "\n".join(parts)
+
+
+def resume_terms(resume_data: ResumeData) -> set:
+    return set(ngrams(tokenize(resume_text(resume_data))))
+
+# --- SCORING ---
+def local_suggestions(missing: List[str], score: int) -> List[str]:
+    suggestions = []
+    if missing:
+        suggestions.append(f"Add evidence of: {', '.join(missing[:5])} (only where it is true).")
+    if score < 50:
+        suggestions.append("Mirror the job description's wording for tools and responsibilities you already have.")
+    if score < 80:
+        suggestions.append("List required tools in the Skills section and repeat the key ones in your bullets.")
+    return suggestions
+
+
+def score_resume(resume_data: ResumeData, jd_text: str, profile: Optional[JDProfile] = None,
+                 max_missing: int = 10) -> ATSEvaluation:
+    """Deterministic keyword-coverage ATS score. No network calls."""
+    if not jd_text:
+        return ATSEvaluation(score=100, missing_keywords=[], suggestions=["No JD provided for comparison."])
+    profile = profile if profile is not None else get_jd_profile(jd_text)
+    total = sum(profile.terms.values())
+    if not total:
+        return ATSEvaluation(score=100, missing_keywords=[], suggestions=[])
+
+    present = resume_terms(resume_data)
+    covered = sum(weight for term, weight in profile.terms.items() if term in present)
+    score = int(round(100 * covered / total))
+    missing = [term for term, _ in sorted(profile.terms.items(), key=lambda kv: (-kv[1], kv[0]))
+               if term not in present and is_keyword(term)][:max_missing]
+    return ATSEvaluation(score=score, missing_keywords=missing, suggestions=local_suggestions(missing, score))
+
+# --- BATCH RANKING ---
+class RankedResume(BaseModel):
+    rank: int
+    index: int  # position in the input list
+    full_name: str
+    score: int
+    similarity: float
+    missing_keywords: List[str]
+
+
+def _count_vocab_terms(tokens: List[str], vocab_index: Dict[str, int], phrase_starts: set, max_n: int):
+    """Returns (column, count) pairs for every vocabulary term occurring in `tokens`."""
+    counts = Counter()
+    for token, count in Counter(tokens).items():
+        col = vocab_index.get(token)
+        if col is not None:
+            counts[col] += count
+    if phrase_starts:
+        for i, token in enumerate(tokens):
+            if token in phrase_starts:
+                for n in range(2, max_n + 1):
+                    col = vocab_index.get(" ".join(tokens[i:i + n]))
+                    if col is not None:
+                        counts[col] += 1
+    return counts.items()
+
+
+def rank_resumes(resumes: List[ResumeData], jd_text: str, max_missing: int = 10, k1: float = 1.2) -> List[RankedResume]:
+    """
+    Ranks many resumes against one JD in a single vectorized pass.
+    Builds an N x V term-count matrix over the JD vocabulary; `score` is the same weighted coverage
+    as score_resume, `similarity` is the cosine between BM25/IDF-weighted resume rows and the JD weights
+    (IDF taken over the submitted resumes). Sorted by score, then similarity.
+    """
+    if not resumes:
+        return []
+    profile = get_jd_profile(jd_text)
+    vocab = list(profile.terms)
+    if not vocab:
+        return [RankedResume(rank=i + 1, index=i, full_name=r.full_name, score=100, similarity=0.0, missing_keywords=[])
+                for i, r in enumerate(resumes)]
+    vocab_index = {term: col for col, term in enumerate(vocab)}
+    phrase_starts = {term.split()[0] for term in vocab if " " in term}
+    max_n = max(len(term.split()) for term in vocab)
+    weights = np.array([profile.terms[term] for term in vocab], dtype=np.float64)
+
+    rows, cols, data = [], [], []
+    for row, resume in enumerate(resumes):
+        for col, count in _count_vocab_terms(tokenize(resume_text(resume)), vocab_index, phrase_starts, max_n):
+            rows.append(row)
+            cols.append(col)
+            data.append(count)
+    counts = np.zeros((len(resumes), len(vocab)), dtype=np.float64)
+    counts[rows, cols] = data
+    present = counts > 0
+
+    coverage = present @ weights / weights.sum()
+    scores = np.rint(coverage * 100).astype(int)
+
+    n_docs = len(resumes)
+    df = present.sum(axis=0)
+    idf = np.log((n_docs - df + 0.5) / (df + 0.5) + 1.0)
+    tfidf = counts * (k1 + 1) / (counts + k1) * idf
+    norms = np.linalg.norm(tfidf, axis=1) * np.linalg.norm(weights)
+    similarity = np.divide(tfidf @ weights, norms, out=np.zeros(n_docs), where=norms > 0)
+
+    by_weight = np.array([col for col in np.argsort(-weights, kind="stable") if is_keyword(vocab[col])], dtype=int)
+    missing_mask = ~present[:, by_weight]
+    order = np.lexsort((-similarity, -scores))
+
+    ranked = []
+    for rank, i in enumerate(order, start=1):
+        missing_cols = by_weight[np.flatnonzero(missing_mask[i])[:max_missing]]
+        ranked.append(RankedResume(
+            rank=rank,
+            index=int(i),
+            full_name=resumes[i].full_name,
+            score=int(scores[i]),
+            similarity=round(float(similarity[i]), 4),
+            missing_keywords=[vocab[c] for c in missing_cols],
+        ))
+    return ranked
@@ -1,21 +1,39 @@
 import sqlite3
 import hashlib
 import os
+import threading
 
 DB_NAME = "users.db"
 
+# Schema migrations, applied in order. The database records how many have run in PRAGMA user_version;
+# append new steps, never edit old ones.
+MIGRATIONS = [
+    '''
+    CREATE TABLE IF NOT EXISTS users (
+        username TEXT PRIMARY KEY,
+        password TEXT NOT NULL
+    )
+    ''',
+]
+
+_initialized = set()
+_init_lock = threading.Lock()
+
 def init_db():
-    """Initialize the SQLite database for users."""
-    conn = sqlite3.connect(DB_NAME)
-    c = conn.cursor()
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS users (
-            username TEXT PRIMARY KEY,
-            password TEXT NOT NULL
-        )
-    ''')
-    conn.commit()
-    conn.close()
+    """Initialize the SQLite database for users. Runs pending migrations once per process."""
+    with _init_lock:
+        if DB_NAME in _initialized:
+            return
+        conn = sqlite3.connect(DB_NAME)
+        try:
+            version = conn.execute('PRAGMA user_version').fetchone()[0]
+            for number, statement in enumerate(MIGRATIONS[version:], start=version + 1):
+                conn.execute(statement)
+                conn.execute(f'PRAGMA user_version = {number}')
+            conn.commit()
+        finally:
+            conn.close()
+        _initialized.add(DB_NAME)
 
 def hash_password(password):
     """Hash a password for storing."""
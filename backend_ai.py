@@ -1,77 +1,215 @@
 import os
 import json
+import hashlib
+import copy
+import threading
+import time
+import queue
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+from io import BytesIO
 from openai import OpenAI
 from docx import Document
 from docx.shared import Pt, Inches, RGBColor
 from docx.enum.text import WD_ALIGN_PARAGRAPH, WD_TAB_ALIGNMENT, WD_BREAK
 from docx.oxml.ns import qn
 from docx.oxml import OxmlElement
-from pydantic import BaseModel, Field
-from typing import List, Set
+from docx.text.paragraph import Paragraph
+from typing import Iterator, List, Set
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pypdf import PdfReader
 from dotenv import load_dotenv
+import llm_cache
+import llm_guard
+import model_router
+import jd_library
+import ats_engine
+import ooxml_writer
+import extraction_cache
+import resume_chunking
+import resume_parser
 
 load_dotenv()
 
 # --- DATA STRUCTURES ---
-class ATSEvaluation(BaseModel):
-    score: int
-    missing_keywords: List[str]
-    suggestions: List[str]
-
-class ExperienceItem(BaseModel):
-    role: str = ""
-    company: str = ""
-    duration: str = ""
-    location: str = ""
-    summary_input: str = ""
-    tech_stack: str = ""
-    enhanced_bullets: List[str] = Field(default_factory=list)
-
-class ResumeData(BaseModel):
-    full_name: str = ""
-    contact_info: str = ""
-    education: List[dict] = Field(default_factory=list)
-    skills: dict = Field(default_factory=dict)
-    experience: List[ExperienceItem] = Field(default_factory=list)
+# Re-exported here; the rest of the app uses backend_ai.ResumeData etc.
+from models import ATSEvaluation, ExperienceItem, ResumeData
 
 # --- UTILITIES ---
-def extract_text_from_pdf(file_stream):
+PARSE_CHAR_BUDGET = 8000  # largest text sent in one parse call; longer resumes are parsed in chunks
+MAX_UPLOAD_CHARS = 60000  # safety cap on text extracted from an upload
+PARALLEL_PAGE_THRESHOLD = 8  # smaller PDFs are not worth a process pool
+
+def iter_pdf_pages(file_stream) -> Iterator[str]:
+    """Yields page text lazily, one page at a time."""
     reader = PdfReader(file_stream)
-    text = ""
     for page in reader.pages:
-        text += page.extract_text() + "\n"
-    return text
+        yield page.extract_text() or ""
+
+def _extract_page_range(pdf_bytes: bytes, start: int, stop: int) -> List[str]:
+    # Process-pool worker: each worker opens its own reader
+    reader = PdfReader(BytesIO(pdf_bytes))
+    return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+def iter_pdf_pages_parallel(file_stream, max_workers: int = None) -> Iterator[str]:
+    """Like iter_pdf_pages, but extracts page ranges of large PDFs on a process pool (still yields in page order)."""
+    pdf_bytes = file_stream.getvalue() if hasattr(file_stream, "getvalue") else file_stream.read()
+    page_count = len(PdfReader(BytesIO(pdf_bytes)).pages)
+    workers = max_workers or os.cpu_count() or 1
+    if page_count < PARALLEL_PAGE_THRESHOLD or workers < 2:
+        yield from iter_pdf_pages(BytesIO(pdf_bytes))
+        return
+
+    # Small ranges keep early stopping cheap: unstarted ranges are cancelled
+    step = max(1, page_count // (workers * 2))
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        futures = [pool.submit(_extract_page_range, pdf_bytes, start, min(start + step, page_count))
+                   for start in range(0, page_count, step)]
+        for future in futures:
+            yield from future.result()
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+def _collect_pages(pages: Iterator[str], max_chars: int = None) -> str:
+    parts = []
+    size = 0
+    for page_text in pages:
+        parts.append(page_text + "\n")
+        size += len(parts[-1])
+        if max_chars is not None and size >= max_chars:
+            pages.close()
+            break
+    text = "".join(parts)
+    return text[:max_chars] if max_chars is not None else text
+
+def extract_text_from_pdf(file_stream, max_chars: int = None, parallel: bool = False, max_workers: int = None):
+    """
+    Args:
+        max_chars: Stop reading pages once this many characters are collected (and trim to it).
+        parallel: Extract pages of large PDFs on a process pool.
+    """
+    pages = iter_pdf_pages_parallel(file_stream, max_workers) if parallel else iter_pdf_pages(file_stream)
+    return _collect_pages(pages, max_chars)
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+def iter_docx_pages(file_stream) -> Iterator[str]:
+    """
+    Streams paragraph text straight out of word/document.xml (no python-docx object tree).
+    Yields one string per page, split on explicit and last-rendered page breaks; each paragraph ends with a newline.
+    """
+    with zipfile.ZipFile(file_stream) as zf, zf.open("word/document.xml") as xml:
+        page = []
+        for _, el in ET.iterparse(xml, events=("end",)):
+            if el.tag != f"{_W}p":
+                continue
+            text = []
+            page_break = False
+            for child in (c for run in el.iter(f"{_W}r") for c in run):
+                if child.tag == f"{_W}t":
+                    text.append(child.text or "")
+                elif child.tag == f"{_W}tab":
+                    text.append("\t")
+                elif child.tag in (f"{_W}br", f"{_W}cr"):
+                    if child.get(f"{_W}type") == "page":
+                        page_break = True
+                    else:
+                        text.append("\n")
+                elif child.tag == f"{_W}lastRenderedPageBreak":
+                    page_break = True
+            # Clearing also keeps nested (text box) paragraphs from being read twice
+            el.clear()
+            page.append("".join(text) + "\n")
+            if page_break:
+                yield "".join(page)
+                page = []
+        if page:
+            yield "".join(page)
+
+def extract_text_from_docx(file_stream, max_chars: int = None):
+    return _collect_pages(iter_docx_pages(file_stream), max_chars)
+
+def _is_docx(file_bytes: bytes) -> bool:
+    # Any zip (xlsx, odt, plain archives) starts with PK; only a Word package has the main document part
+    try:
+        with zipfile.ZipFile(BytesIO(file_bytes)) as archive:
+            return "word/document.xml" in archive.namelist()
+    except zipfile.BadZipFile:
+        return False
+
+def detect_format(file_bytes: bytes, filename: str = None) -> str:
+    if file_bytes.startswith(b"%PDF"):
+        return "pdf"
+    if file_bytes.startswith(b"PK"):
+        if _is_docx(file_bytes):
+            return "docx"
+        raise ValueError("Unsupported file type. Please upload a PDF or DOCX resume.")
+    extension = os.path.splitext(filename or "")[1].lower().lstrip(".")
+    if extension in ("pdf", "docx"):
+        return extension
+    raise ValueError("Unsupported file type. Please upload a PDF or DOCX resume.")
+
+def extract_text(file_stream, filename: str = None, max_chars: int = None, parallel: bool = False):
+    """Format-dispatching extraction for uploads (PDF or DOCX), with the same character-budget semantics."""
+    file_bytes = file_stream.getvalue() if hasattr(file_stream, "getvalue") else file_stream.read()
+    filename = filename or getattr(file_stream, "name", None)
+    if detect_format(file_bytes, filename) == "docx":
+        return extract_text_from_docx(BytesIO(file_bytes), max_chars=max_chars)
+    return extract_text_from_pdf(BytesIO(file_bytes), max_chars=max_chars, parallel=parallel)
 
 # --- AI AGENT ---
-class ResumeAgent:
-    def __init__(self):
-        api_key = os.getenv("OPENROUTER_API_KEY")
-        if not api_key:
-            raise ValueError("OPENROUTER_API_KEY missing")
-            
-        self.client = OpenAI(
-            base_url="https://openrouter.ai/api/v1",
-            api_key=api_key,
-        )
-        self.model_name = "google/gemini-1.5-flash" 
+OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+DEFAULT_MODEL = "google/gemini-1.5-flash"  # used for every task without a route (see model_router)
+NO_JD_CONTEXT = "General industry standards for this role."
+STREAM_FORMAT = {"type": "text"}  # cache-key marker for plain-text streamed responses
 
-    def _call_llm(self, system_prompt: str, user_prompt: str):
-        try:
-            completion = self.client.chat.completions.create(
-                model=self.model_name,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt},
-                ],
-                response_format={"type": "json_object"} 
-            )
-            return completion.choices[0].message.content
-        except Exception as e:
-            print(f"API Error: {e}")
-            return None
+_BULLET_MARKER_RE = re.compile(r"^\s*(?:[-*•●▪]|\d+[.)])\s*")
+
+def iter_completed_lines(chunks: Iterator[str]) -> Iterator[str]:
+    """Re-chunks streamed text into complete, non-empty lines with list markers stripped."""
+    buffer = ""
+    for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            line = _BULLET_MARKER_RE.sub("", line).strip()
+            if line:
+                yield line
+    line = _BULLET_MARKER_RE.sub("", buffer).strip()
+    if line:
+        yield line
+
+class ResumeAgentBase:
+    """Prompt construction and response parsing shared by ResumeAgent and AsyncResumeAgent."""
+
+    def __init__(self, cache=None, router=None, jd_library_store=None):
+        """
+        Args:
+            cache: Response cache (see llm_cache). Defaults to the shared process-wide cache;
+                pass llm_cache.NullCache() to disable caching.
+            router: Per-task model chains and route stats (see model_router). Defaults to the
+                process-wide router configured from the environment / model_routes.json.
+            jd_library_store: Where JD digests and keyword profiles are kept (see jd_library).
+                Defaults to the shared jd_library.db.
+        """
+        self.model_name = DEFAULT_MODEL
+        self.cache = cache if cache is not None else llm_cache.get_default_cache()
+        self.router = router if router is not None else model_router.get_default_router()
+        self.jd_library = jd_library_store if jd_library_store is not None else jd_library.get_default_jd_library()
 
-    def parse_resume_text(self, raw_text: str) -> ResumeData:
+    def models_for(self, task: str = None) -> List[str]:
+        """Preferred model for `task` followed by its fallbacks; just model_name when unrouted."""
+        return self.router.chain(task, self.model_name)
+
+    def _jd_context(self, jd_text: str) -> str:
+        # Boilerplate-free requirements + keywords digest, computed once per JD and stored in the JD library
+        if not jd_text:
+            return NO_JD_CONTEXT
+        return self.jd_library.get(jd_text).digest.render()[:3000] or jd_text[:3000]
+
+    def _parse_prompts(self, raw_text: str, part: tuple = None, fields: List[str] = None):
         system_prompt = """
         You are a Resume Parser. Extract data into this exact JSON structure:
         {
@@ -91,17 +229,39 @@ class ResumeAgent:
             ]
         }
         """
-        user_prompt = f"Parse this:\n{raw_text[:8000]}"
-        response = self._call_llm(system_prompt, user_prompt)
+        user_prompt = f"Parse this:\n{raw_text[:PARSE_CHAR_BUDGET]}"
+        if part:
+            user_prompt = (
+                f"This is part {part[0]} of {part[1]} of one resume. "
+                "Extract only what appears in this part and leave everything else empty.\n" + user_prompt
+            )
+        if fields:
+            user_prompt = f"Fill only these fields: {', '.join(fields)}. Leave all other fields empty.\n" + user_prompt
+        return system_prompt, user_prompt
+
+    def _parse_chunks(self, raw_text: str) -> List[str]:
+        # Leave room for the "(continued)" section prefix
+        return resume_chunking.split_resume_text(raw_text, PARSE_CHAR_BUDGET - 200)
+
+    def _parse_resume_response(self, response) -> ResumeData:
         try:
             return ResumeData(**json.loads(response))
         except:
             return ResumeData()
 
-    def audit_resume(self, resume_data: ResumeData, jd_text: str) -> ATSEvaluation:
-        if not jd_text:
-            return ATSEvaluation(score=100, missing_keywords=[], suggestions=["No JD provided for comparison."])
+    def _is_resume_reply(self, response) -> bool:
+        try:
+            ResumeData(**json.loads(response))
+            return True
+        except:
+            return False
+
+    def _local_parse(self, raw_text: str):
+        # Heuristic pre-parse; returns it with the fields still worth an LLM call
+        local = resume_parser.heuristic_parse(raw_text)
+        return local, local.low_confidence()
 
+    def _resume_summary(self, resume_data: ResumeData) -> str:
         # Use enhanced bullets if available, otherwise fallback to summary_input
         experience_text = []
         for job in resume_data.experience:
@@ -110,11 +270,13 @@ class ResumeAgent:
             else:
                 experience_text.append(job.summary_input)
 
-        resume_str = f"""
+        return f"""
         Skills: {resume_data.skills}
         Experience: {experience_text}
         """
 
+    def _audit_prompts(self, resume_data: ResumeData, jd_text: str):
+        resume_str = self._resume_summary(resume_data)
         system_prompt = """
         You are an ATS (Applicant Tracking System) Scanner. 
         Your job is to compare a Resume against a Job Description (JD).
@@ -125,18 +287,72 @@ class ResumeAgent:
             "suggestions": ["suggestion1", "suggestion2"]
         }
         """
-        user_prompt = f"JOB DESCRIPTION: {jd_text[:3000]}\nRESUME: {resume_str}"
-        response_text = self._call_llm(system_prompt, user_prompt)
+        user_prompt = f"JOB DESCRIPTION: {self._jd_context(jd_text)}\nRESUME: {resume_str}"
+        return system_prompt, user_prompt
+
+    def _audit_response(self, response_text) -> ATSEvaluation:
         try:
             return ATSEvaluation(**json.loads(response_text))
         except:
             return ATSEvaluation(score=0, missing_keywords=["Error parsing audit"], suggestions=[])
 
-    def generate_cover_letter(self, resume_data: ResumeData, jd_text: str) -> str:
+    def _is_audit_reply(self, response_text) -> bool:
+        try:
+            ATSEvaluation(**json.loads(response_text))
+            return True
+        except:
+            return False
+
+    def _suggestion_prompts(self, resume_data: ResumeData, jd_text: str, evaluation: ATSEvaluation):
+        # Score and keywords come from ats_engine; the model only writes the advice.
+        resume_str = self._resume_summary(resume_data)
+        system_prompt = """
+        You are an ATS (Applicant Tracking System) coach.
+        The resume below has already been scored against the Job Description (JD).
+        Give short, concrete suggestions to improve the match.
+        OUTPUT FORMAT (JSON):
+        {
+            "suggestions": ["suggestion1", "suggestion2"]
+        }
+        """
+        user_prompt = (
+            f"JOB DESCRIPTION: {self._jd_context(jd_text)}\n"
+            f"ATS SCORE: {evaluation.score}/100\n"
+            f"MISSING KEYWORDS: {', '.join(evaluation.missing_keywords)}\n"
+            f"RESUME: {resume_str}"
+        )
+        return system_prompt, user_prompt
+
+    def _with_suggestions(self, evaluation: ATSEvaluation, response_text) -> ATSEvaluation:
+        # Keep the locally generated suggestions if the model's answer is unusable
+        try:
+            suggestions = json.loads(response_text)["suggestions"]
+            if isinstance(suggestions, list) and suggestions:
+                evaluation.suggestions = [str(s) for s in suggestions]
+        except:
+            pass
+        return evaluation
+
+    def _is_suggestions_reply(self, response_text) -> bool:
+        try:
+            suggestions = json.loads(response_text)["suggestions"]
+            return isinstance(suggestions, list) and bool(suggestions)
+        except:
+            return False
+
+    def _cover_letter_prompts(self, resume_data: ResumeData, jd_text: str):
         resume_str = f"Name: {resume_data.full_name}\nExperience: {[job.enhanced_bullets for job in resume_data.experience]}"
         system_prompt = "Write a professional cover letter connecting the candidate's experience to the JD. Return JSON: { 'cover_letter': 'text...' }"
-        user_prompt = f"Candidate: {resume_str}\nJD: {jd_text[:3000]}"
-        response = self._call_llm(system_prompt, user_prompt)
+        user_prompt = f"Candidate: {resume_str}\nJD: {self._jd_context(jd_text)}"
+        return system_prompt, user_prompt
+
+    def _cover_letter_stream_prompts(self, resume_data: ResumeData, jd_text: str):
+        # Plain text instead of JSON so every streamed token is displayable as-is
+        _, user_prompt = self._cover_letter_prompts(resume_data, jd_text)
+        system_prompt = "Write a professional cover letter connecting the candidate's experience to the JD. Return only the letter text."
+        return system_prompt, user_prompt
+
+    def _cover_letter_response(self, response) -> str:
         try:
             data = json.loads(response)
             return data.get("cover_letter", str(data))
@@ -144,89 +360,463 @@ class ResumeAgent:
             return response
 
     # --- UPDATED: REWRITE LOGIC WITH QUILLBOT EMULATION ---
-    def rewrite_all_jobs(self, jobs: List[ExperienceItem], target_role: str, jd_text: str = "", tone: str = "Standard") -> List[ExperienceItem]:
+    def _rewrite_prompts(self, job: ExperienceItem, target_role: str, jd_context: str, tone: str, forbidden_verbs: Set[str],
+                         plain: bool = False):
+        forbidden_list_str = ", ".join(sorted(forbidden_verbs))
+
+        # --- TONE LOGIC ---
+        if tone == "Humanized":
+            # This prompt simulates Quillbot's "Humanize" logic
+            style_guide = """
+            MODE: QUILLBOT HUMANIZER / FLUENCY PARAPHRASER.
+            Your goal is to rewrite the text to bypass AI detection and sound completely natural.
+            
+            STRICT GUIDELINES:
+            1. SENTENCE VARIANCE: Do NOT start every sentence with a verb. Mix clauses (e.g., "By leveraging Python, I built..." instead of "Built...").
+            2. VOCABULARY: Use simple, direct, high-fluency English. Avoid robotic words like 'Orchestrated', 'Pivotal', 'Spearheaded'.
+            3. TONE: Write as if you are explaining your work to a friend, but professionally.
+            4. STRUCTURE: Keep the metrics, but weave them naturally into the narrative.
+            """
+        else: # Standard / ATS Optimized
+            style_guide = """
+            MODE: HIGH-IMPACT ATS OPTIMIZER.
+            1. START every bullet with a power verb (Engineered, Deployed, Architected).
+            2. MAXIMIZE keyword density from the JD.
+            3. BE AGGRESSIVE with metrics and results.
+            """
+
+        # Per-job values stay out of the system prompt, so it is identical for every job of a run
+        system_prompt = f"""
+        You are an expert Resume Writer optimizing for a specific Job Description.
+        TARGET ROLE: {target_role}
+        
+        {style_guide}
+        
+        JOB DESCRIPTION (JD) CONTEXT:
+        {jd_context}
+        
+        CRITICAL RULES:
+        1. UNIQUE ACTION VERBS: Do NOT use the "Avoid verbs" listed with the job if possible.
+        2. KEYWORD INJECTION: If the JD mentions specific skills matching the job's Tech Stack, include them.
+        3. METRICS: Every bullet point must have a quantifiable result.
         """
-        Processes all jobs sequentially.
-        Args:
-            tone (str): "Standard" (Aggressive ATS) or "Humanized" (Quillbot Mode).
+
+        user_prompt = f"""
+        Rewrite this job into 3 bullets.
+        
+        Role: {job.role}
+        Tech Stack: {job.tech_stack}
+        Raw Summary: {job.summary_input}
+        Avoid verbs: [{forbidden_list_str}]
+        
+        Output format: JSON list of strings (e.g. {{ "bullets": ["..."] }})
         """
-        used_verbs: Set[str] = set()
-        processed_jobs = []
-        jd_context = jd_text[:3000] if jd_text else "General industry standards for this role."
+        if plain:
+            # Streaming: one bullet per line, so each can be shown as soon as its newline arrives
+            user_prompt = user_prompt.replace(
+                'JSON list of strings (e.g. { "bullets": ["..."] })', "one bullet per line, plain text, no numbering or JSON"
+            )
+        return system_prompt, user_prompt
+
+    def _parse_bullets(self, response_text, job: ExperienceItem) -> List[str]:
+        try:
+            data = json.loads(response_text)
+            if isinstance(data, list): return data
+            elif "bullets" in data: return data["bullets"]
+            else: return list(data.values())[0]
+        except:
+            return self._fallback_bullets(job)
+
+    def _is_bullets_reply(self, response_text, job: ExperienceItem) -> bool:
+        bullets = self._parse_bullets(response_text, job)
+        return isinstance(bullets, list) and bool(bullets) and bullets != self._fallback_bullets(job)
+
+    def _fallback_bullets(self, job: ExperienceItem) -> List[str]:
+        return [f"Managed {job.role} responsibilities.", "Optimized team workflows."]
 
+    def _job_fingerprint(self, job: ExperienceItem, target_role: str, jd_text: str, tone: str) -> str:
+        """Hash of everything a rewrite depends on; a job whose fingerprint still matches keeps its bullets."""
+        payload = json.dumps([
+            job.role, job.company, job.tech_stack, job.summary_input, target_role,
+            hashlib.sha256((jd_text or "").encode()).hexdigest(), tone, self.models_for("rewrite")[0],
+        ])
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _stale_jobs(self, jobs: List[ExperienceItem], target_role: str, jd_text: str, tone: str):
+        """(job, fingerprint) pairs that need a rewrite; unchanged jobs with bullets are skipped."""
+        stale = []
         for job in jobs:
-            forbidden_list_str = ", ".join(list(used_verbs))
-            
-            # --- TONE LOGIC ---
-            if tone == "Humanized":
-                # This prompt simulates Quillbot's "Humanize" logic
-                style_guide = """
-                MODE: QUILLBOT HUMANIZER / FLUENCY PARAPHRASER.
-                Your goal is to rewrite the text to bypass AI detection and sound completely natural.
-                
-                STRICT GUIDELINES:
-                1. SENTENCE VARIANCE: Do NOT start every sentence with a verb. Mix clauses (e.g., "By leveraging Python, I built..." instead of "Built...").
-                2. VOCABULARY: Use simple, direct, high-fluency English. Avoid robotic words like 'Orchestrated', 'Pivotal', 'Spearheaded'.
-                3. TONE: Write as if you are explaining your work to a friend, but professionally.
-                4. STRUCTURE: Keep the metrics, but weave them naturally into the narrative.
-                """
-            else: # Standard / ATS Optimized
-                style_guide = """
-                MODE: HIGH-IMPACT ATS OPTIMIZER.
-                1. START every bullet with a power verb (Engineered, Deployed, Architected).
-                2. MAXIMIZE keyword density from the JD.
-                3. BE AGGRESSIVE with metrics and results.
-                """
-
-            system_prompt = f"""
-            You are an expert Resume Writer optimizing for a specific Job Description.
-            TARGET ROLE: {target_role}
-            
-            {style_guide}
-            
-            JOB DESCRIPTION (JD) CONTEXT:
-            {jd_context}
-            
-            CRITICAL RULES:
-            1. UNIQUE ACTION VERBS: Do NOT use these words if possible: [{forbidden_list_str}].
-            2. KEYWORD INJECTION: If the JD mentions specific skills matching the user's stack ({job.tech_stack}), include them.
-            3. METRICS: Every bullet point must have a quantifiable result.
-            """
+            fingerprint = self._job_fingerprint(job, target_role, jd_text, tone)
+            if job.fingerprint != fingerprint or not job.enhanced_bullets:
+                stale.append((job, fingerprint))
+        return stale
 
-            user_prompt = f"""
-            Rewrite this job into 3 bullets.
-            
-            Role: {job.role}
-            Tech Stack: {job.tech_stack}
-            Raw Summary: {job.summary_input}
-            
-            Output format: JSON list of strings (e.g. {{ "bullets": ["..."] }})
-            """
+    def _store_rewrite(self, job: ExperienceItem, bullets: List[str], fingerprint: str):
+        job.enhanced_bullets = bullets
+        # Fallback bullets from a failed call are shown but not remembered, so the next run retries
+        job.fingerprint = fingerprint if bullets != self._fallback_bullets(job) else ""
 
-            response_text = self._call_llm(system_prompt, user_prompt)
+class ResumeAgent(ResumeAgentBase):
+    def __init__(self, cache=None, router=None, jd_library_store=None):
+        api_key = os.getenv("OPENROUTER_API_KEY")
+        if not api_key:
+            raise ValueError("OPENROUTER_API_KEY missing")
             
-            new_bullets = []
+        self.client = OpenAI(
+            base_url=OPENROUTER_BASE_URL,
+            api_key=api_key,
+            max_retries=0,  # retries, backoff and rate limiting live in llm_guard
+        )
+        super().__init__(cache=cache, router=router, jd_library_store=jd_library_store)
+
+    def _call_llm(self, system_prompt: str, user_prompt: str, response_format=None, task: str = None, validate=None):
+        """
+        Tries each model routed for `task` in order until one answers. With `validate`, only replies it
+        accepts are cached or end the chain; if none passes, the first reply is returned uncached.
+        """
+        if response_format is None:
+            response_format = {"type": "json_object"}
+        fallback = None
+        for model in self.models_for(task):
+            cache_key = llm_cache.make_cache_key(model, system_prompt, user_prompt, response_format)
+            cached = self.cache.get(cache_key)
+            if cached is not None and (validate is None or validate(cached)):
+                return cached
+            # Identical requests already in flight (other sessions, double clicks) share one upstream call
+            content = llm_cache.get_single_flight().do(
+                cache_key, lambda: self._fetch_llm(model, task, cache_key, system_prompt, user_prompt, response_format, validate)
+            )
+            if content and (validate is None or validate(content)):
+                return content
+            fallback = fallback or content
+        return fallback
+
+    def _fetch_llm(self, model: str, task: str, cache_key: str, system_prompt: str, user_prompt: str, response_format,
+                   validate=None):
+        start = time.perf_counter()
+        try:
+            completion = llm_guard.call_with_retry(lambda: self.client.chat.completions.create(
+                model=model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt},
+                ],
+                response_format=response_format,
+                timeout=llm_guard.REQUEST_TIMEOUT
+            ), llm_guard.estimate_tokens(system_prompt, user_prompt))
+            content = completion.choices[0].message.content
+        except Exception as e:
+            print(f"API Error ({model}): {e}")
+            self.router.record(task, model, time.perf_counter() - start, ok=False)
+            return None
+        valid = bool(content) and (validate is None or validate(content))
+        self.router.record(task, model, time.perf_counter() - start, getattr(completion, "usage", None), ok=valid)
+        # Malformed replies are not cached, otherwise they would be replayed until the entry expires
+        if valid:
+            self.cache.set(cache_key, content)
+        return content
+
+    def _stream_llm(self, system_prompt: str, user_prompt: str, task: str = None, outcome: dict = None) -> Iterator[str]:
+        """
+        Yields plain-text deltas as they arrive; a cached response is yielded whole.
+        Falls back to the next routed model only if the stream can't be opened; a failure
+        mid-stream ends it with what was already shown. If given, `outcome["complete"]` is set
+        to True only when a whole response was delivered.
+        """
+        outcome = outcome if outcome is not None else {}
+        outcome["complete"] = False
+        for model in self.models_for(task):
+            cache_key = llm_cache.make_cache_key(model, system_prompt, user_prompt, STREAM_FORMAT)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                yield cached
+                outcome["complete"] = True
+                return
+            start = time.perf_counter()
+            tokens = llm_guard.estimate_tokens(system_prompt, user_prompt)
             try:
-                data = json.loads(response_text)
-                if isinstance(data, list): new_bullets = data
-                elif "bullets" in data: new_bullets = data["bullets"]
-                else: new_bullets = list(data.values())[0]
-            except:
-                new_bullets = [f"Managed {job.role} responsibilities.", "Optimized team workflows."]
-
-            for bullet in new_bullets:
-                words = bullet.split()
-                if words:
-                    first_word = words[0].strip(".,").capitalize()
-                    used_verbs.add(first_word)
-            
-            job.enhanced_bullets = new_bullets
+                stream = llm_guard.call_with_retry(lambda: self.client.chat.completions.create(
+                    model=model,
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": user_prompt},
+                    ],
+                    stream=True,
+                    stream_options={"include_usage": True},  # usage arrives on a final, choice-less chunk
+                    timeout=llm_guard.REQUEST_TIMEOUT
+                ), tokens)
+            except Exception as e:
+                print(f"API Error ({model}): {e}")
+                self.router.record(task, model, time.perf_counter() - start, ok=False)
+                continue
+            parts = []
+            usage = None
+            try:
+                for chunk in stream:
+                    usage = getattr(chunk, "usage", None) or usage
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if delta:
+                        parts.append(delta)
+                        yield delta
+            except Exception as e:
+                print(f"API Error ({model}): {e}")
+                self.router.record(task, model, time.perf_counter() - start, usage, ok=False)
+                llm_guard.get_default_limiter().settle(tokens, usage)
+                return
+            self.router.record(task, model, time.perf_counter() - start, usage, ok=bool(parts))
+            # call_with_retry only saw the stream object, so the TPM bucket is corrected here
+            llm_guard.get_default_limiter().settle(tokens, usage)
+            if parts:
+                self.cache.set(cache_key, "".join(parts))
+                outcome["complete"] = True
+            return
+
+    def parse_resume_text(self, raw_text: str, max_workers: int = 8, use_local: bool = True) -> ResumeData:
+        """
+        The rule-based parser (resume_parser) fills what it can first; only the sections behind
+        low-confidence fields go to the LLM, and a well-formatted resume needs no call at all.
+        Text longer than PARSE_CHAR_BUDGET is split on section/job boundaries, parsed
+        concurrently and merged (map-reduce), so nothing past the budget is dropped.
+        """
+        return self._parse_checked(raw_text, max_workers, use_local)[0]
+
+    def _parse_checked(self, raw_text: str, max_workers: int = 8, use_local: bool = True):
+        # parse_resume_text plus whether every field sent to the LLM came back filled
+        if not use_local:
+            parsed = self._parse_with_llm(raw_text, max_workers)
+            return parsed, all(getattr(parsed, field) for field in resume_parser.FIELDS)
+        local, fields = self._local_parse(raw_text)
+        if not fields:
+            return local.data, True
+        parsed = self._parse_with_llm(local.text_for(fields), max_workers, fields)
+        return local.merged_with(parsed, fields), all(getattr(parsed, field) for field in fields)
+
+    def _parse_with_llm(self, raw_text: str, max_workers: int = 8, fields: List[str] = None) -> ResumeData:
+        if len(raw_text) <= PARSE_CHAR_BUDGET:
+            response = self._call_llm(*self._parse_prompts(raw_text, fields=fields), task="parse",
+                                      validate=self._is_resume_reply)
+            return self._parse_resume_response(response)
+
+        chunks = self._parse_chunks(raw_text)
+        def parse_chunk(i):
+            response = self._call_llm(*self._parse_prompts(chunks[i], part=(i + 1, len(chunks)), fields=fields), task="parse",
+                                      validate=self._is_resume_reply)
+            return self._parse_resume_response(response)
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(chunks)))) as pool:
+            parts = list(pool.map(parse_chunk, range(len(chunks))))
+        return resume_chunking.merge_resume_parts(parts)
+
+    def audit_resume(self, resume_data: ResumeData, jd_text: str, mode: str = "hybrid") -> ATSEvaluation:
+        """
+        Args:
+            mode (str): "hybrid" scores locally with ats_engine and asks the LLM only for suggestions,
+                "local" makes no network call at all, "llm" sends the whole audit to the model.
+        """
+        if not jd_text:
+            return ATSEvaluation(score=100, missing_keywords=[], suggestions=["No JD provided for comparison."])
+        if mode == "llm":
+            response_text = self._call_llm(*self._audit_prompts(resume_data, jd_text), task="audit",
+                                           validate=self._is_audit_reply)
+            return self._audit_response(response_text)
+
+        evaluation = ats_engine.score_resume(resume_data, jd_text, profile=self.jd_library.get(jd_text).profile)
+        if mode == "local":
+            return evaluation
+        response_text = self._call_llm(*self._suggestion_prompts(resume_data, jd_text, evaluation), task="audit",
+                                       validate=self._is_suggestions_reply)
+        return self._with_suggestions(evaluation, response_text)
+
+    def generate_cover_letter(self, resume_data: ResumeData, jd_text: str) -> str:
+        response = self._call_llm(*self._cover_letter_prompts(resume_data, jd_text), task="cover_letter")
+        return self._cover_letter_response(response)
+
+    def stream_cover_letter(self, resume_data: ResumeData, jd_text: str) -> Iterator[str]:
+        """generate_cover_letter as a stream of text deltas (e.g. for st.write_stream)."""
+        return self._stream_llm(*self._cover_letter_stream_prompts(resume_data, jd_text), task="cover_letter")
+
+    def _rewrite_job(self, job: ExperienceItem, target_role: str, jd_context: str, tone: str, forbidden_verbs: Set[str]) -> List[str]:
+        system_prompt, user_prompt = self._rewrite_prompts(job, target_role, jd_context, tone, forbidden_verbs)
+        response_text = self._call_llm(system_prompt, user_prompt, task="rewrite",
+                                       validate=lambda reply: self._is_bullets_reply(reply, job))
+        return self._parse_bullets(response_text, job)
+
+    def rewrite_all_jobs(self, jobs: List[ExperienceItem], target_role: str, jd_text: str = "", tone: str = "Standard",
+                         concurrent: bool = False, max_workers: int = 8) -> List[ExperienceItem]:
+        """
+        Processes all jobs sequentially, or in parallel when `concurrent` is set. Jobs whose
+        inputs (role, company, stack, tasks, target role, JD, tone) are unchanged since their last
+        rewrite keep their enhanced_bullets, so an edit costs one call per edited job.
+        Args:
+            tone (str): "Standard" (Aggressive ATS) or "Humanized" (Quillbot Mode).
+            concurrent (bool): Run one LLM call per job on a bounded thread pool. The unique-verb rule is
+                then enforced afterwards by dedupe_action_verbs instead of through the prompt.
+            max_workers (int): Upper bound on parallel calls in concurrent mode.
+        """
+        jd_context = self._jd_context(jd_text)
+        stale = {id(job): fingerprint for job, fingerprint in self._stale_jobs(jobs, target_role, jd_text, tone)}
+
+        if concurrent:
+            changed = [job for job in jobs if id(job) in stale]
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(changed)))) as pool:
+                results = list(pool.map(
+                    lambda job: self._rewrite_job(job, target_role, jd_context, tone, set()), changed
+                ))
+            for job, new_bullets in zip(changed, results):
+                self._store_rewrite(job, new_bullets, stale[id(job)])
+            dedupe_action_verbs(jobs, keep=[job for job in jobs if id(job) not in stale])
+            return list(jobs)
+
+        # Verbs of unchanged jobs count as used, so re-written jobs still avoid them
+        used_verbs: Set[str] = {_first_word(b) for job in jobs if id(job) not in stale for b in job.enhanced_bullets} - {""}
+        processed_jobs = []
+        for job in jobs:
+            if id(job) in stale:
+                new_bullets = self._rewrite_job(job, target_role, jd_context, tone, used_verbs)
+
+                for bullet in new_bullets:
+                    verb = _first_word(bullet)
+                    if verb:
+                        used_verbs.add(verb)
+
+                self._store_rewrite(job, new_bullets, stale[id(job)])
             processed_jobs.append(job)
             
         return processed_jobs
 
+    def stream_rewrite_all_jobs(self, jobs: List[ExperienceItem], target_role: str, jd_text: str = "",
+                                tone: str = "Standard", max_workers: int = 8) -> Iterator[tuple]:
+        """
+        Streaming rewrite_all_jobs: changed jobs stream concurrently and each bullet is yielded as
+        (job_index, bullet) as soon as its line is complete. When the generator is exhausted the
+        jobs hold their final bullets (verb-deduplicated, same as concurrent rewrite_all_jobs).
+        """
+        jd_context = self._jd_context(jd_text)
+        stale = {id(job): fingerprint for job, fingerprint in self._stale_jobs(jobs, target_role, jd_text, tone)}
+        changed = [(i, job) for i, job in enumerate(jobs) if id(job) in stale]
+        events = queue.Queue()
+
+        complete = {}  # job index -> its stream delivered a whole response
+
+        def stream_job(i, job):
+            bullets = []
+            outcome = {}
+            try:
+                prompts = self._rewrite_prompts(job, target_role, jd_context, tone, set(), plain=True)
+                for bullet in iter_completed_lines(self._stream_llm(*prompts, task="rewrite", outcome=outcome)):
+                    bullets.append(bullet)
+                    events.put((i, bullet))
+            finally:
+                # Not fingerprinted yet: that waits for a complete stream and the dedupe pass below
+                self._store_rewrite(job, bullets or self._fallback_bullets(job), "")
+                complete[i] = bool(bullets) and outcome.get("complete", False)
+                events.put((i, None))
+
+        if changed:
+            pool = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(changed))))
+            try:
+                for i, job in changed:
+                    pool.submit(stream_job, i, job)
+                remaining = len(changed)
+                while remaining:
+                    i, bullet = events.get()
+                    if bullet is None:
+                        remaining -= 1
+                    else:
+                        yield i, bullet
+            finally:
+                # A consumer that stops early (closed generator, Streamlit rerun) must not wait on
+                # the streams still running; queued jobs are dropped
+                pool.shutdown(wait=False, cancel_futures=True)
+        dedupe_action_verbs(jobs, keep=[job for job in jobs if id(job) not in stale])
+        # Truncated streams (and any run abandoned before this point) stay unfingerprinted, so the next run retries them
+        for i, job in changed:
+            if complete.get(i):
+                self._store_rewrite(job, job.enhanced_bullets, stale[id(job)])
+
+# --- ACTION VERB DEDUPLICATION ---
+# Interchangeable past-tense power verbs. Used to resolve collisions locally, without another LLM call.
+VERB_SYNONYMS = [
+    ["Developed", "Built", "Engineered", "Created", "Designed", "Implemented", "Architected", "Constructed", "Authored", "Programmed"],
+    ["Led", "Directed", "Headed", "Spearheaded", "Managed", "Oversaw", "Supervised", "Coordinated", "Orchestrated"],
+    ["Improved", "Optimized", "Enhanced", "Streamlined", "Refined", "Upgraded", "Boosted", "Accelerated"],
+    ["Reduced", "Cut", "Decreased", "Lowered", "Minimized", "Trimmed"],
+    ["Increased", "Grew", "Expanded", "Raised", "Amplified", "Scaled"],
+    ["Deployed", "Launched", "Shipped", "Delivered", "Released"],
+    ["Analyzed", "Evaluated", "Assessed", "Examined", "Investigated", "Audited"],
+    ["Automated", "Scripted", "Systematized"],
+    ["Collaborated", "Partnered", "Cooperated", "Teamed"],
+    ["Migrated", "Transitioned", "Ported", "Moved"],
+    ["Integrated", "Unified", "Consolidated", "Merged", "Combined"],
+    ["Resolved", "Fixed", "Debugged", "Troubleshot", "Diagnosed"],
+    ["Established", "Founded", "Initiated", "Instituted", "Introduced"],
+    ["Mentored", "Coached", "Trained", "Guided", "Tutored"],
+    ["Maintained", "Sustained", "Supported", "Preserved"],
+    ["Achieved", "Attained", "Accomplished", "Secured"],
+    ["Leveraged", "Utilized", "Employed", "Applied", "Used"],
+]
+_VERB_GROUPS = {verb: group for group in VERB_SYNONYMS for verb in group}
+
+def _first_word(bullet: str) -> str:
+    words = bullet.split()
+    return words[0].strip(".,").capitalize() if words else ""
+
+def dedupe_action_verbs(jobs: List[ExperienceItem], keep: List[ExperienceItem] = ()) -> List[ExperienceItem]:
+    """
+    Deterministic post-pass: walks bullets in resume order and swaps the leading verb of any bullet
+    that repeats an earlier one for an unused synonym. Bullets without a known verb are left alone.
+    Jobs in `keep` are not modified; their verbs are reserved up front.
+    """
+    kept = {id(job) for job in keep}
+    used_verbs: Set[str] = {_first_word(b) for job in keep for b in job.enhanced_bullets} - {""}
+    for job in jobs:
+        if id(job) in kept:
+            continue
+        new_bullets = []
+        for bullet in job.enhanced_bullets:
+            verb = _first_word(bullet)
+            if verb in used_verbs and verb in _VERB_GROUPS:
+                alternative = next((v for v in _VERB_GROUPS[verb] if v not in used_verbs), None)
+                if alternative:
+                    parts = bullet.strip().split(None, 1)
+                    suffix = parts[0][len(parts[0].rstrip(".,")):]
+                    bullet = " ".join([alternative + suffix] + parts[1:])
+                    verb = alternative
+            if verb:
+                used_verbs.add(verb)
+            new_bullets.append(bullet)
+        job.enhanced_bullets = new_bullets
+    return jobs
+
+# --- UPLOAD PIPELINE ---
+def parse_uploaded_resume(agent: ResumeAgent, file_stream, cache: extraction_cache.ExtractionCache = None):
+    """
+    Extracts and parses an uploaded resume, reusing earlier results for byte-identical files
+    (across sessions) so a re-upload skips both pypdf and the parse LLM call.
+    Returns (raw_text, ResumeData).
+    """
+    cache = cache if cache is not None else extraction_cache.get_default_extraction_cache()
+    file_bytes = file_stream.getvalue() if hasattr(file_stream, "getvalue") else file_stream.read()
+    digest = extraction_cache.file_digest(file_bytes)
+
+    raw_text = cache.get_text(digest, MAX_UPLOAD_CHARS)
+    if raw_text is None:
+        raw_text = extract_text(BytesIO(file_bytes), filename=getattr(file_stream, "name", None),
+                                max_chars=MAX_UPLOAD_CHARS)
+        cache.set_text(digest, raw_text, MAX_UPLOAD_CHARS)
+
+    parse_model = agent.models_for("parse")[0]
+    parsed = cache.get_parsed(digest, parse_model)
+    if parsed is None:
+        parsed, complete = agent._parse_checked(raw_text)
+        # Don't pin a failed or partial LLM parse to this file; the local fallback is still returned
+        if complete:
+            cache.set_parsed(digest, parse_model, parsed)
+    return raw_text, parsed
+
 # --- DOCUMENT RENDERER (Layout Engine) ---
-def create_styled_resume(data: ResumeData, filename="Generated_Resume.docx"):
+SECTION_TITLES = ("EDUCATION", "SKILLS", "WORK EXPERIENCE")
+
+def _build_base_document():
     doc = Document()
     
     # 1. PAGE MARGINS (0.5 inch)
@@ -241,89 +831,182 @@ def create_styled_resume(data: ResumeData, filename="Generated_Resume.docx"):
     font = style.font
     font.name = 'Calibri'
     font.size = Pt(10.5)
+    return doc
+
+# 3. HELPER: BORDER FUNCTION
+def add_bottom_border(paragraph):
+    p = paragraph._p
+    pPr = p.get_or_add_pPr()
+    bottom = OxmlElement('w:pBdr')
+    border = OxmlElement('w:bottom')
+    border.set(qn('w:val'), 'single')
+    border.set(qn('w:sz'), '6')
+    border.set(qn('w:space'), '1')
+    border.set(qn('w:color'), '000000')
+    bottom.append(border)
+    pPr.append(bottom)
+
+def _build_fragments(doc) -> dict:
+    """
+    Builds every paragraph shape the layout uses once, as detached <w:p> elements:
+    complete bordered section headers, plus empty paragraphs carrying only their formatting.
+    """
+    fragments = {}
+    for title in SECTION_TITLES:
+        head = doc.add_paragraph(title)
+        head.runs[0].bold = True
+        head.runs[0].font.size = Pt(11)
+        add_bottom_border(head)
+        fragments[title] = head
+
+    fragments["center"] = doc.add_paragraph()
+    fragments["center"].alignment = WD_ALIGN_PARAGRAPH.CENTER
+    fragments["contact"] = doc.add_paragraph()
+    fragments["contact"].alignment = WD_ALIGN_PARAGRAPH.CENTER
+    fragments["contact"].paragraph_format.space_after = Pt(12)
+    fragments["tabbed"] = doc.add_paragraph()
+    fragments["tabbed"].paragraph_format.tab_stops.add_tab_stop(Inches(7.5), WD_TAB_ALIGNMENT.RIGHT)
+    fragments["job_line1"] = doc.add_paragraph()
+    fragments["job_line1"].paragraph_format.space_after = Pt(0)
+    fragments["job_line1"].paragraph_format.tab_stops.add_tab_stop(Inches(7.5), WD_TAB_ALIGNMENT.RIGHT)
+    fragments["bullet"] = doc.add_paragraph(style='List Bullet')
+    fragments["bullet"].paragraph_format.space_after = Pt(0)
+    for points in (0, 2, 6, 8):
+        fragments[f"space_{points}"] = doc.add_paragraph()
+        fragments[f"space_{points}"].paragraph_format.space_after = Pt(points)
 
-    # 3. HELPER: BORDER FUNCTION
-    def add_bottom_border(paragraph):
+    elements = {}
+    for name, paragraph in fragments.items():
         p = paragraph._p
-        pPr = p.get_or_add_pPr()
-        bottom = OxmlElement('w:pBdr')
-        border = OxmlElement('w:bottom')
-        border.set(qn('w:val'), 'single')
-        border.set(qn('w:sz'), '6')
-        border.set(qn('w:space'), '1')
-        border.set(qn('w:color'), '000000')
-        bottom.append(border)
-        pPr.append(bottom)
+        p.getparent().remove(p)
+        elements[name] = p
+    return elements
+
+_template_lock = threading.Lock()
+_template = None
+
+def _get_template():
+    """Styled base document and paragraph fragments, built once per process."""
+    global _template
+    with _template_lock:
+        if _template is None:
+            doc = _build_base_document()
+            _template = (doc, _build_fragments(doc))
+        return _template
+
+_ooxml_package = None
+
+def _get_ooxml_package() -> ooxml_writer.StaticPackage:
+    """Non-body parts of the styled template, captured once for the streaming backend."""
+    global _ooxml_package
+    template, _ = _get_template()
+    with _template_lock:
+        if _ooxml_package is None:
+            buffer = BytesIO()
+            copy.deepcopy(template).save(buffer)
+            _ooxml_package = ooxml_writer.StaticPackage(buffer.getvalue())
+        return _ooxml_package
+
+def _add_fragment(doc, fragments: dict, name: str, text: str = ""):
+    p = copy.deepcopy(fragments[name])
+    doc.element.body._insert_p(p)
+    paragraph = Paragraph(p, doc._body)
+    if text:
+        paragraph.add_run(text)
+    return paragraph
+
+def create_styled_resume(data: ResumeData, filename="Generated_Resume.docx", use_template: bool = True,
+                         engine: str = "docx"):
+    """
+    Renders the resume as DOCX.
+    Args:
+        filename: A path (saved to disk, path returned), a writable binary file object
+            (written into, object returned) or None (rendered in memory, bytes returned).
+        use_template: Clone the cached base document and fragments (default). False rebuilds
+            them for this render only, which is what every render used to cost.
+        engine: "docx" builds the document with python-docx; "ooxml" streams word/document.xml
+            straight into the zip (same layout, see ooxml_writer.compare_layouts) for bulk export.
+    """
+    if engine == "ooxml":
+        docx_bytes = _get_ooxml_package().write(data)
+        if filename is None:
+            return docx_bytes
+        if hasattr(filename, "write"):
+            filename.write(docx_bytes)
+            return filename
+        with open(filename, "wb") as f:
+            f.write(docx_bytes)
+        return filename
+    if engine != "docx":
+        raise ValueError(f"Unknown render engine: {engine}")
+
+    if use_template:
+        template, fragments = _get_template()
+        doc = copy.deepcopy(template)
+    else:
+        doc = _build_base_document()
+        fragments = _build_fragments(doc)
 
     # 4. HEADER
-    h_name = doc.add_paragraph()
-    h_name.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    h_name = _add_fragment(doc, fragments, "center")
     run = h_name.add_run(data.full_name)
     run.bold = True
     run.font.size = Pt(16)
     
-    h_contact = doc.add_paragraph()
-    h_contact.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    h_contact.add_run(data.contact_info)
-    h_contact.paragraph_format.space_after = Pt(12)
+    # Always emit the run (an empty <w:r/> when there is no contact line), as the original layout did
+    _add_fragment(doc, fragments, "contact").add_run(data.contact_info)
 
     # 5. EDUCATION
-    head_edu = doc.add_paragraph("EDUCATION")
-    head_edu.runs[0].bold = True
-    head_edu.runs[0].font.size = Pt(11)
-    add_bottom_border(head_edu)
+    _add_fragment(doc, fragments, "EDUCATION")
 
     for edu in data.education:
-        p = doc.add_paragraph()
-        p.paragraph_format.tab_stops.add_tab_stop(Inches(7.5), WD_TAB_ALIGNMENT.RIGHT)
+        p = _add_fragment(doc, fragments, "tabbed")
         r1 = p.add_run(edu.get('school', ''))
         r1.bold = True
         p.add_run(f"\t{edu.get('year', '')}")
-        p2 = doc.add_paragraph(edu.get('degree', ''))
-        p2.paragraph_format.space_after = Pt(8)
+        _add_fragment(doc, fragments, "space_8", edu.get('degree', ''))
 
     # 6. SKILLS
-    head_skills = doc.add_paragraph("SKILLS")
-    head_skills.runs[0].bold = True
-    head_skills.runs[0].font.size = Pt(11)
-    add_bottom_border(head_skills)
+    _add_fragment(doc, fragments, "SKILLS")
     
     for cat, items in data.skills.items():
-        p = doc.add_paragraph()
-        p.paragraph_format.space_after = Pt(0)
+        p = _add_fragment(doc, fragments, "space_0")
         r = p.add_run(f"{cat}: ")
         r.bold = True
         p.add_run(str(items))
-    doc.add_paragraph().paragraph_format.space_after = Pt(8)
+    _add_fragment(doc, fragments, "space_8")
 
     # 7. EXPERIENCE
-    head_exp = doc.add_paragraph("WORK EXPERIENCE")
-    head_exp.runs[0].bold = True
-    head_exp.runs[0].font.size = Pt(11)
-    add_bottom_border(head_exp)
+    _add_fragment(doc, fragments, "WORK EXPERIENCE")
 
     for job in data.experience:
-        p_line1 = doc.add_paragraph()
-        p_line1.paragraph_format.space_after = Pt(0)
-        p_line1.paragraph_format.tab_stops.add_tab_stop(Inches(7.5), WD_TAB_ALIGNMENT.RIGHT)
-        
+        p_line1 = _add_fragment(doc, fragments, "job_line1")
         r_role = p_line1.add_run(job.role)
         r_role.bold = True
         r_role.font.size = Pt(11)
         p_line1.add_run(f"\t{job.duration}")
 
-        p_line2 = doc.add_paragraph()
-        p_line2.paragraph_format.space_after = Pt(2)
+        p_line2 = _add_fragment(doc, fragments, "space_2")
         r_comp = p_line2.add_run(job.company)
         r_comp.italic = True
         p_line2.add_run(f" | {job.location}")
 
         for bullet in job.enhanced_bullets:
-            p_bull = doc.add_paragraph(style='List Bullet')
-            p_bull.add_run(bullet)
-            p_bull.paragraph_format.space_after = Pt(0)
+            _add_fragment(doc, fragments, "bullet", bullet)
         
-        doc.add_paragraph().paragraph_format.space_after = Pt(6)
+        _add_fragment(doc, fragments, "space_6")
 
+    if filename is None:
+        buffer = BytesIO()
+        doc.save(buffer)
+        return buffer.getvalue()
     doc.save(filename)
-    return filename
\ No newline at end of file
+    return filename
+
+def render_resume_bytes(data: ResumeData, engine: str = "docx") -> bytes:
+    """In-memory render for download buttons and APIs; never touches the filesystem."""
+    return create_styled_resume(data, filename=None, engine=engine)
+
+def check_render_engines(data: ResumeData) -> List[str]:
+    """Layout differences between the python-docx and streaming OOXML output for `data` (empty when equivalent)."""
+    return ooxml_writer.compare_layouts(render_resume_bytes(data), render_resume_bytes(data, engine="ooxml"))
\ No newline at end of file
@@ -0,0 +1,43 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Callable, List, Optional, Union
+
+import backend_ai as backend
+from models import ResumeData
+
+# --- WORKER ---
+def _render_payload(payload: str, engine: str, path: Optional[str]) -> Union[bytes, str]:
+    # Runs in a worker process; each worker builds its own document template once
+    data = ResumeData.model_validate_json(payload)
+    return backend.create_styled_resume(data, filename=path, engine=engine)
+
+# --- BULK API ---
+def render_many(resumes: List[ResumeData], out_dir: Optional[str] = None, engine: str = "docx",
+                max_workers: Optional[int] = None, chunksize: Optional[int] = None,
+                progress: Optional[Callable[[int, int], None]] = None) -> List[Union[bytes, str]]:
+    """
+    Renders many resumes on a ProcessPoolExecutor (rendering is CPU-bound, threads don't help).
+    Resumes cross the process boundary as compact JSON. Returns, in input order, the DOCX bytes,
+    or file paths under `out_dir` when it is given. `progress(done, total)` is called as results arrive.
+    """
+    total = len(resumes)
+    if not total:
+        return []
+    workers = max_workers or os.cpu_count() or 1
+    if chunksize is None:
+        chunksize = max(1, total // (workers * 4))
+    payloads = [resume.model_dump_json(exclude_defaults=True) for resume in resumes]
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+        paths = [os.path.join(out_dir, f"Resume_{i + 1:05d}.docx") for i in range(total)]
+    else:
+        paths = [None] * total
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for result in pool.map(_render_payload, payloads, repeat(engine), paths, chunksize=chunksize):
+            results.append(result)
+            if progress:
+                progress(len(results), total)
+    return results
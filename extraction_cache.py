@@ -0,0 +1,58 @@
+import hashlib
+import threading
+from typing import Optional
+
+import llm_cache
+from models import ResumeData
+
+EXTRACTION_DB_NAME = "extraction_cache.db"
+
+def file_digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+class ExtractionCache:
+    """
+    Extracted text and parsed ResumeData per uploaded file, keyed by the SHA-256 of its bytes.
+    Backed by the same memory + SQLite tiers as the LLM response cache, so it persists across
+    sessions and evicts by TTL and size.
+    """
+
+    def __init__(self, store=None):
+        self.store = store if store is not None else llm_cache.LLMCache(
+            memory=llm_cache.MemoryCache(max_entries=128),
+            persistent=llm_cache.SQLiteCache(EXTRACTION_DB_NAME, table="extractions",
+                                             max_entries=2000, ttl=30 * 24 * 3600),
+        )
+
+    def get_text(self, digest: str, max_chars: Optional[int] = None) -> Optional[str]:
+        return self.store.get(f"text:{max_chars}:{digest}")
+
+    def set_text(self, digest: str, text: str, max_chars: Optional[int] = None):
+        self.store.set(f"text:{max_chars}:{digest}", text)
+
+    def get_parsed(self, digest: str, model: str) -> Optional[ResumeData]:
+        payload = self.store.get(f"parsed:{model}:{digest}")
+        return ResumeData.model_validate_json(payload) if payload is not None else None
+
+    def set_parsed(self, digest: str, model: str, resume_data: ResumeData):
+        self.store.set(f"parsed:{model}:{digest}", resume_data.model_dump_json())
+
+    def evict_parsed(self, digest: str, model: str):
+        self.store.delete(f"parsed:{model}:{digest}")
+
+    def clear(self):
+        self.store.clear()
+
+    def stats(self) -> dict:
+        return self.store.stats()
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+def get_default_extraction_cache() -> ExtractionCache:
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = ExtractionCache()
+        return _default_cache
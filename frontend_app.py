@@ -1,6 +1,9 @@
 import streamlit as st
+import streamlit.components.v1 as components
+from streamlit.errors import StreamlitAPIException
 import backend_ai as backend
 import auth
+import static_assets
 import os
 
 # --- 1. PAGE CONFIG & APPLE-STYLE CSS ---
@@ -44,594 +47,56 @@ if "logged_in" not in st.session_state:
 if "username" not in st.session_state:
     st.session_state.username = None
 
+# --- SHARED RESOURCES (built once per server process, not per rerun or session) ---
+@st.cache_resource
+def init_database():
+    auth.init_db()
+    return True
+
+@st.cache_resource
+def get_agent():
+    # Thread-safe and stateless per request, so every session can share one client/connection pool
+    return backend.ResumeAgent()
+
+# --- STATIC ASSETS ---
+def inject_css(name, scope="global"):
+    """Sends assets/<name>.css (minified, content-hashed) once per session; later reruns send nothing."""
+    css, digest = static_assets.load_css(name) if name else ("", "none")
+    injected = st.session_state.setdefault("injected_css", {})
+    if injected.get(scope, "none") == digest:
+        return
+    script = static_assets.css_injector(css, digest, scope)
+    if hasattr(st, "iframe"):
+        # Newer Streamlit replaces components.html with st.iframe (which needs a positive height)
+        st.iframe(script, height=1)
+    else:
+        components.html(script, height=0)
+    injected[scope] = digest
+
+def use_page_css(name):
+    """Swaps in the styles of one page (landing/login/register); None removes them."""
+    inject_css(name, scope="page")
+
 # Initialize DB
-auth.init_db()
+init_database()
 
 if "agent" not in st.session_state:
     if not os.environ.get("OPENROUTER_API_KEY"):
         # We don't stop here to allow landing page to load even if key is missing (user might fix it later)
         pass
     else:
-        st.session_state.agent = backend.ResumeAgent()
+        st.session_state.agent = get_agent()
 
 if "resume_data" not in st.session_state:
     st.session_state.resume_data = {
         "full_name": "", "contact": "", "skills": {}, "education": "", "jobs": []
     }
 
-# Inject Apple-inspired CSS
-st.markdown("""
-<style>
-    /* 1. Global Reset */
-    .stApp {
-        background-color: #f5f5f7;
-        font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, Helvetica, Arial, sans-serif;
-    }
-
-    /* Selection Color */
-    ::selection {
-        background: #0071e3; /* Apple Blue */
-        color: white;
-    }
-    
-    /* 2. Aligned Icon Headers */
-    .icon-header {
-        display: flex;
-        align-items: center;
-        gap: 8px; /* Space between icon and text */
-        font-weight: 600;
-        font-size: 1.1rem;
-        color: #1d1d1f;
-        margin-bottom: 8px; /* Tight spacing to input */
-    }
-    
-    .icon-header span {
-        font-size: 1.3rem; /* Slightly larger icon */
-        line-height: 1;
-    }
-
-    /* 3. Hero Typography */
-    .hero-kicker {
-        font-size: 0.9rem;
-        text-transform: uppercase;
-        letter-spacing: 1.5px;
-        color: #86868b;
-        font-weight: 600;
-        margin-bottom: 10px;
-    }
-
-    .hero-title {
-        font-size: 3.5rem;
-        font-weight: 700;
-        text-align: left; /* Changed to left */
-        line-height: 1.1;
-        margin-bottom: 1rem;
-        background: -webkit-linear-gradient(90deg, #1d1d1f 0%, #434344 100%);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-    }
-    
-    .hero-subtitle {
-        font-size: 1.2rem;
-        text-align: left; /* Changed to left */
-        color: #86868b;
-        font-weight: 400;
-        margin-bottom: 2rem;
-        max-width: 90%;
-    }
-
-    /* Upload Box Styling */
-    .upload-container {
-        border: 2px dashed #a1a1a6;
-        border-radius: 12px;
-        padding: 2rem;
-        text-align: center;
-        background: rgba(255,255,255,0.5);
-        transition: all 0.3s ease;
-        margin-bottom: 2rem;
-    }
-    .upload-container:hover {
-        border-color: #0071e3;
-        background: rgba(255,255,255,0.8);
-    }
-
-    /* Mock Laptop UI */
-    .laptop-container {
-        position: relative;
-        width: 100%;
-        padding-top: 60%; /* Aspect ratio */
-        background: #1d1d1f;
-        border-radius: 12px 12px 0 0;
-        box-shadow: 0 20px 40px rgba(0,0,0,0.2);
-        margin-top: 20px;
-        border: 1px solid #424245;
-    }
-    .laptop-screen {
-        position: absolute;
-        top: 4%;
-        left: 4%;
-        right: 4%;
-        bottom: 4%;
-        background: #f5f5f7;
-        overflow: hidden;
-        border-radius: 4px;
-    }
-    .laptop-base {
-        height: 12px;
-        background: #424245;
-        border-radius: 0 0 12px 12px;
-        margin-bottom: 20px;
-    }
-    
-    /* Mock UI Elements */
-    .mock-header { height: 40px; background: #fff; border-bottom: 1px solid #e5e5e5; display: flex; align-items: center; padding: 0 15px; }
-    .mock-dot { width: 8px; height: 8px; border-radius: 50%; background: #ff5f57; margin-right: 6px; }
-    .mock-dot.yellow { background: #febc2e; }
-    .mock-dot.green { background: #28c840; }
-    .mock-content { padding: 20px; display: grid; grid-template-columns: 1fr 2fr; gap: 15px; }
-    .mock-sidebar { background: #fff; height: 150px; border-radius: 8px; }
-    .mock-main { background: #fff; height: 150px; border-radius: 8px; }
-
-    /* Trust Badge */
-    .trust-badge {
-        display: flex;
-        align-items: center;
-        gap: 10px;
-        font-size: 0.9rem;
-        color: #1d1d1f;
-        margin-top: 20px;
-        font-weight: 500;
-    }
-    .stars { color: #00b67a; }
-
-    /* 4. Glassmorphism Cards (Inputs) */
-    div[data-testid="stExpander"] {
-        background-color: #ffffff;
-        border-radius: 16px;
-        border: 1px solid rgba(0,0,0,0.05);
-        box-shadow: 0 2px 8px rgba(0,0,0,0.04);
-        margin-bottom: 12px;
-    }
-    
-    /* 5. Input Fields Styling - Apple Aesthetic */
-    .stTextInput > div > div > input {
-        background-color: rgba(255, 255, 255, 0.8) !important;
-        border-radius: 12px !important;
-        border: 1px solid rgba(0, 0, 0, 0.1) !important;
-        padding: 12px 15px !important;
-        font-size: 1rem !important;
-        color: #1d1d1f !important;
-        box-shadow: 0 2px 5px rgba(0,0,0,0.02) !important;
-        transition: all 0.2s ease !important;
-    }
-    .stTextInput > div > div > input:focus {
-        border-color: #0071e3 !important;
-        box-shadow: 0 0 0 4px rgba(0,113,227,0.15) !important;
-        background-color: #ffffff !important;
-    }
-    
-    /* 6. Buttons (Pill Shaped & Greyish Transparent) */
-    .stButton > button {
-        background-color: rgba(0, 0, 0, 0.05);
-        color: #1d1d1f;
-        border-radius: 980px;
-        border: 1px solid rgba(0, 0, 0, 0.1);
-        padding: 0.6rem 1.5rem;
-        font-weight: 500;
-        backdrop-filter: blur(10px);
-        transition: all 0.2s ease;
-    }
-    div.stButton > button:hover {
-        transform: scale(1.02);
-        background-color: rgba(0, 0, 0, 0.1);
-        border-color: rgba(0, 0, 0, 0.2);
-        color: #000000;
-    }
-
-    /* Primary Button (Simulated via specific text match or just overriding all for login) */
-    /* We will use a specific container class for login buttons if needed, 
-       but for now, let's make the "Sign In" button distinctive if we can. 
-       Actually, Streamlit allows type="primary". */
-    button[kind="primary"] {
-        background-color: #0071e3 !important;
-        color: white !important;
-        border: none !important;
-        box-shadow: 0 4px 12px rgba(0, 113, 227, 0.3) !important;
-    }
-    button[kind="primary"]:hover {
-        background-color: #0077ed !important;
-        box-shadow: 0 6px 16px rgba(0, 113, 227, 0.4) !important;
-        transform: scale(1.02) !important;
-    }
-
-    /* 11. Auth Card Container */
-    .auth-container {
-        max-width: 400px;
-        margin: 0 auto;
-        padding: 40px;
-        background: rgba(255, 255, 255, 0.7);
-        backdrop-filter: blur(20px);
-        -webkit-backdrop-filter: blur(20px);
-        border-radius: 24px;
-        box-shadow: 0 8px 32px rgba(0, 0, 0, 0.08);
-        border: 1px solid rgba(255, 255, 255, 0.4);
-        text-align: center;
-    }
-    .auth-header {
-        font-size: 2rem;
-        font-weight: 700;
-        margin-bottom: 0.5rem;
-        color: #1d1d1f;
-    }
-    .auth-sub {
-        font-size: 1rem;
-        color: #86868b;
-        margin-bottom: 2rem;
-    }
-    /* 12. Float Animation for Logo */
-    @keyframes float {
-        0% { transform: translateY(0px); }
-        50% { transform: translateY(-10px); }
-        100% { transform: translateY(0px); }
-    }
-    /* 13. Apple-Style Mesh Background */
-    .mesh-background {
-        position: fixed;
-        top: 0;
-        left: 0;
-        width: 100vw;
-        height: 100vh;
-        z-index: -1;
-        background-color: #f5f5f7;
-        background-image: 
-            radial-gradient(at 0% 0%, rgba(173, 216, 230, 0.4) 0px, transparent 50%),
-            radial-gradient(at 100% 0%, rgba(220, 220, 255, 0.4) 0px, transparent 50%),
-            radial-gradient(at 100% 100%, rgba(200, 240, 220, 0.3) 0px, transparent 50%),
-            radial-gradient(at 0% 100%, rgba(240, 230, 250, 0.4) 0px, transparent 50%),
-            radial-gradient(at 50% 50%, rgba(255, 255, 255, 0.8) 0px, transparent 50%);
-        filter: blur(80px);
-        animation: meshMove 20s ease-in-out infinite alternate;
-    }
-
-    @keyframes meshMove {
-        0% { transform: scale(1); }
-        100% { transform: scale(1.1); }
-    }
-
-    /* 7. Hide Streamlit Bloat */
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
-    
-    /* Custom File Uploader Styling (Apple Blue) */
-    [data-testid="stFileUploaderDropzone"] {
-        background-color: #f0f8ff; /* Light blue background */
-        border: 2px dashed #0071e3; /* Apple Blue border */
-        border-radius: 12px;
-        padding: 20px;
-        transition: all 0.3s ease;
-    }
-    [data-testid="stFileUploaderDropzone"]:hover {
-        background-color: #e8f2ff; /* Slightly darker on hover */
-        border-color: #005bb5;
-    }
-    [data-testid="stFileUploaderDropzone"] svg {
-        fill: #0071e3; /* Apple Blue Icon */
-    }
-    [data-testid="stFileUploaderDropzoneInstructions"] {
-        color: #1d1d1f;
-    }
-    [data-testid="stFileUploaderDropzone"] small {
-        color: #86868b;
-    }
-    [data-testid="stBaseButton-secondary"] {
-        background-color: white;
-        color: #0071e3;
-        border: 1px solid #0071e3;
-        border-radius: 8px;
-    }
-    [data-testid="stBaseButton-secondary"]:hover {
-        background-color: #0071e3;
-        color: white;
-        border-color: #0071e3;
-    }
-    [data-testid="stBaseButton-secondary"]:active,
-    [data-testid="stBaseButton-secondary"]:focus,
-    [data-testid="stBaseButton-secondary"]:focus:not(:active) {
-        background-color: #005bb5 !important;
-        color: white !important;
-        border-color: #005bb5 !important;
-        box-shadow: none !important;
-    }
+# Inject Apple-inspired CSS (assets/base.css, sent to the browser once per session)
+inject_css("base")
 
-    /* 8. Fix Top Bar Alignment */
-    div[data-testid="column"] {
-        display: flex;
-        flex-direction: column;
-        justify-content: flex-start;
-    }
-
-    /* 9. Landing Page Tiles - Responsive Grid */
-    .feature-grid {
-        display: grid;
-        grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
-        gap: 20px;
-        padding: 20px;
-        width: 100%;
-        max-width: 1200px;
-        margin: 0 auto;
-        box-sizing: border-box;
-    }
-    
-    .feature-card {
-        background-color: #ffffff;
-        border-radius: 18px;
-        padding: 30px;
-        box-shadow: 0 4px 12px rgba(0,0,0,0.05);
-        transition: all 0.3s ease;
-        border: 1px solid rgba(0,0,0,0.05);
-        text-align: center;
-        display: flex;
-        flex-direction: column;
-        align-items: center;
-        justify-content: flex-start;
-        height: 100%;
-        min-height: 200px;
-    }
-    .feature-card:hover {
-        transform: translateY(-5px) scale(1.02);
-        box-shadow: 0 12px 24px rgba(0,0,0,0.1);
-    }
-    .feature-icon {
-        font-size: 3rem;
-        margin-bottom: 15px;
-    }
-    .feature-title {
-        font-size: 1.3rem;
-        font-weight: 600;
-        color: #1d1d1f;
-        margin-bottom: 10px;
-    }
-    .feature-desc {
-        font-size: 1rem;
-        color: #86868b;
-        line-height: 1.5;
-    }
-
-    /* Responsive Breakpoints */
-    @media (max-width: 1024px) {
-        .feature-grid {
-            grid-template-columns: repeat(2, 1fr);
-        }
-    }
-    
-    @media (max-width: 600px) {
-        .feature-grid {
-            grid-template-columns: 1fr;
-        }
-        .hero-title {
-            font-size: 2.5rem !important;
-        }
-        .hero-subtitle {
-            font-size: 1rem !important;
-        }
-        .feature-card {
-            padding: 20px;
-        }
-    }
-    
-    /* Center the Get Started button */
-    .get-started-container {
-        display: flex;
-        justify-content: center;
-        margin-top: 40px;
-        margin-bottom: 60px;
-    }
-    
-    /* Auth Form Styling */
-    .auth-container {
-        max-width: 400px;
-        margin: 0 auto;
-        padding: 2rem;
-        background: white;
-        border-radius: 20px;
-        box-shadow: 0 4px 20px rgba(0,0,0,0.05);
-    }
-    /* 10. Loading Morph Transition - Optimized for Smoothness */
-    @keyframes fadeOut {
-        0% { opacity: 1; }
-        70% { opacity: 1; }
-        100% { opacity: 0; visibility: hidden; }
-    }
-
-    @keyframes morphLogo {
-        0% { 
-            transform: scale(1); 
-            opacity: 1; 
-        }
-        25% { 
-            transform: scale(0.85); 
-            opacity: 1; 
-        }
-        100% { 
-            transform: scale(50); 
-            opacity: 0; 
-        }
-    }
-
-    .loader-overlay {
-        position: fixed;
-        top: 0;
-        left: 0;
-        width: 100vw;
-        height: 100vh;
-        background-color: #f5f5f7;
-        z-index: 999999;
-        display: flex;
-        justify-content: center;
-        align-items: center;
-        /* Performance: animate opacity only, avoid heavy layout thrashing */
-        animation: fadeOut 1.5s cubic-bezier(0.65, 0, 0.35, 1) forwards;
-        will-change: opacity;
-        pointer-events: none;
-    }
-
-    .loader-content {
-        font-size: 5rem;
-        /* Performance: promote to own layer */
-        will-change: transform, opacity;
-        animation: morphLogo 1.5s cubic-bezier(0.65, 0, 0.35, 1) forwards;
-    }
-    /* 14. Feature Sections */
-    .section-container {
-        padding: 80px 0;
-        border-top: 1px solid #d1d1d6;
-    }
-    .section-white {
-        background-color: #ffffff;
-    }
-    .section-grey {
-        background-color: #f5f5f7;
-    }
-    .section-title {
-        font-size: 2.5rem;
-        font-weight: 700;
-        color: #1d1d1f;
-        margin-bottom: 20px;
-        line-height: 1.1;
-    }
-    .section-text {
-        font-size: 1.1rem;
-        color: #86868b;
-        line-height: 1.6;
-        margin-bottom: 20px;
-    }
-    
-    /* Mock Visuals for New Sections */
-    .mock-card-stack {
-        position: relative;
-        height: 300px;
-        width: 100%;
-        display: flex;
-        justify-content: center;
-        align-items: center;
-    }
-    .profile-card {
-        width: 180px;
-        height: 220px;
-        background: white;
-        border-radius: 12px;
-        box-shadow: 0 10px 30px rgba(0,0,0,0.1);
-        position: absolute;
-        border: 1px solid rgba(0,0,0,0.05);
-        display: flex;
-        flex-direction: column;
-        align-items: center;
-        padding: 20px;
-        transition: transform 0.3s ease;
-    }
-    .profile-card:nth-child(1) { transform: translateX(-60px) rotate(-10deg) scale(0.9); z-index: 1; }
-    .profile-card:nth-child(2) { transform: translateX(60px) rotate(10deg) scale(0.9); z-index: 1; }
-    .profile-card:nth-child(3) { transform: translateY(-20px) scale(1); z-index: 2; }
-    
-    .suggestion-box {
-        background: white;
-        border-radius: 12px;
-        padding: 20px;
-        box-shadow: 0 4px 20px rgba(0,0,0,0.05);
-        border-left: 4px solid #0071e3;
-        margin-bottom: 15px;
-        transition: transform 0.3s ease, box-shadow 0.3s ease;
-    }
-    .suggestion-box:hover {
-        transform: scale(1.02);
-        box-shadow: 0 10px 30px rgba(0,0,0,0.1);
-    }
-    .suggestion-box.bad { border-left-color: #ff3b30; opacity: 0.7; }
-    
-    .chart-container {
-        display: flex;
-        align-items: flex-end;
-        height: 200px;
-        gap: 20px;
-        justify-content: center;
-        padding: 20px;
-        background: white;
-        border-radius: 16px;
-        box-shadow: 0 10px 30px rgba(0,0,0,0.05);
-    }
-    .chart-bar {
-        width: 40px;
-        background: #e5e5ea;
-        border-radius: 8px 8px 0 0;
-        transition: height 1s ease;
-    }
-    .chart-bar.active { background: #0071e3; }
-    
-    .checklist-item {
-        display: flex;
-        align-items: center;
-        gap: 15px;
-        margin-bottom: 15px;
-        background: white;
-        padding: 15px;
-        border-radius: 12px;
-        box-shadow: 0 2px 10px rgba(0,0,0,0.03);
-        transition: all 0.3s ease;
-        border: 1px solid transparent;
-    }
-    .checklist-item:hover {
-        transform: scale(1.02);
-        background: #0071e3;
-        border-color: #0071e3;
-        box-shadow: 0 10px 30px rgba(0,113,227,0.3);
-    }
-    .checklist-item:hover .checklist-title {
-        color: white !important;
-    }
-    .checklist-item:hover .checklist-desc {
-        color: rgba(255,255,255,0.9) !important;
-    }
-    .checklist-item:hover .check-circle {
-        background: white;
-        color: #0071e3;
-    }
-    .check-circle {
-        width: 24px;
-        height: 24px;
-        border-radius: 50%;
-        background: #34c759;
-        color: white;
-        display: flex;
-        justify-content: center;
-        align-items: center;
-        font-size: 14px;
-        transition: all 0.3s ease;
-    }
-    
-    /* Login/Register Buttons Styling */
-    div.stButton > button {
-        background-color: #0071e3;
-        color: white;
-        border: none;
-        border-radius: 980px;
-        padding: 0.6rem 1.5rem;
-        font-weight: 500;
-        box-shadow: 0 4px 12px rgba(0, 113, 227, 0.2);
-        transition: all 0.3s ease;
-    }
-    div.stButton > button:hover {
-        transform: scale(1.05);
-        background-color: #0077ed;
-        box-shadow: 0 8px 20px rgba(0, 113, 227, 0.4);
-        color: white;
-        border: none;
-    }
-
-</style>
-
-<!-- Animated Background -->
-<div class="mesh-background"></div>
-""", unsafe_allow_html=True)
+# Animated Background
+st.markdown('<div class="mesh-background"></div>', unsafe_allow_html=True)
 
 # Loading Overlay HTML (Only show once)
 if "loader_shown" not in st.session_state:
@@ -644,197 +109,8 @@ if "loader_shown" not in st.session_state:
 
 def landing_page():
     # --- Custom Fixed Header (Matches Resume Worded Image) ---
+    use_page_css("landing")
     st.markdown("""
-<style>
-    /* Hide default Streamlit header decoration */
-    header[data-testid="stHeader"] {
-        display: none;
-    }
-    
-    /* Main Header Bar */
-    .custom-header {
-        position: fixed;
-        top: 0;
-        left: 0;
-        width: 100%;
-        height: 70px;
-        background-color: rgba(44, 44, 46, 0.85); /* Semi-transparent Grey */
-        backdrop-filter: blur(12px); /* Glassmorphism effect */
-        -webkit-backdrop-filter: blur(12px);
-        display: flex;
-        align-items: center;
-        justify-content: space-between;
-        padding: 0 40px;
-        z-index: 100000;
-        box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-        font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, Helvetica, Arial, sans-serif;
-    }
-    
-    /* Logo Area */
-    .header-left {
-        display: flex;
-        align-items: center;
-        gap: 40px;
-    }
-    .header-logo {
-        color: white;
-        font-weight: 700;
-        font-size: 1.1rem;
-        letter-spacing: 1.5px;
-        text-transform: uppercase;
-        cursor: pointer;
-    }
-    
-    /* Navigation */
-    .header-nav {
-        display: flex;
-        align-items: center;
-        gap: 24px;
-        height: 100%;
-    }
-    
-    /* Dropdown Container */
-    .nav-item-dropdown {
-        position: relative;
-        color: rgba(255,255,255,0.9);
-        font-size: 0.95rem;
-        font-weight: 500;
-        cursor: pointer;
-        height: 100%;
-        display: flex;
-        align-items: center;
-        gap: 5px;
-    }
-    .nav-item-dropdown:hover {
-        color: white;
-    }
-    
-    /* Dropdown Menu Content */
-    .dropdown-menu {
-        position: absolute;
-        top: 70px;
-        left: -20px;
-        width: 320px;
-        background: rgba(44, 44, 46, 0.95); /* Medium transparent grey */
-        backdrop-filter: blur(16px); /* Strong blur */
-        -webkit-backdrop-filter: blur(16px);
-        border-radius: 12px;
-        box-shadow: 0 10px 40px rgba(0,0,0,0.3);
-        padding: 10px;
-        display: none; /* Hidden by default */
-        flex-direction: column;
-        z-index: 100001;
-        border: 1px solid rgba(255,255,255,0.1);
-    }
-    
-    /* Show on Hover */
-    .nav-item-dropdown:hover .dropdown-menu {
-        display: flex;
-        animation: fadeIn 0.2s ease-out;
-    }
-    
-    @keyframes fadeIn {
-        from { opacity: 0; transform: translateY(10px); }
-        to { opacity: 1; transform: translateY(0); }
-    }
-    
-    /* Dropdown Items */
-    .dropdown-item {
-        display: flex;
-        align-items: flex-start;
-        padding: 12px 20px;
-        text-decoration: none;
-        transition: transform 0.2s ease, background 0.1s ease;
-        gap: 15px;
-        border-radius: 6px;
-    }
-    .dropdown-item:hover {
-        background-color: #0071e3;
-        transform: scale(1.02);
-    }
-    .dropdown-item:hover .dd-title {
-        color: white;
-    }
-    .dropdown-item:hover .dd-desc {
-        color: rgba(255,255,255,0.9);
-    }
-    .dropdown-item:hover .dd-icon {
-        background: white;
-    }
-
-    .dd-icon {
-        font-size: 1.4rem;
-        background: #e8f2ff;
-        width: 36px;
-        height: 36px;
-        border-radius: 50%;
-        display: flex;
-        justify-content: center;
-        align-items: center;
-        flex-shrink: 0;
-    }
-    
-    .dd-text {
-        display: flex;
-        flex-direction: column;
-    }
-    .dd-title {
-        font-weight: 700;
-        font-size: 0.85rem;
-        color: white; /* Changed to white for dark background */
-        margin-bottom: 2px;
-        text-transform: uppercase;
-        letter-spacing: 0.5px;
-    }
-    .dd-desc {
-        font-size: 0.8rem;
-        color: #a1a1a6; /* Lighter grey for dark background */
-        line-height: 1.3;
-    }
-    
-    /* Header Buttons */
-    .header-btn-link {
-        color: white;
-        font-size: 0.95rem;
-        font-weight: 500;
-        text-decoration: none;
-        padding: 8px 16px;
-        border-radius: 6px;
-        transition: background 0.2s;
-    }
-    .header-btn-link:hover {
-        background: rgba(255,255,255,0.1);
-    }
-    
-    .header-cta {
-        display: inline-flex;
-        align-items: center;
-        justify-content: center;
-        background: linear-gradient(135deg, #0071e3 0%, #4facfe 100%);
-        color: white !important;
-        padding: 10px 24px;
-        border-radius: 980px;
-        font-weight: 600;
-        font-size: 0.95rem;
-        text-decoration: none !important;
-        box-shadow: 0 4px 12px rgba(0,113,227,0.3);
-        transition: transform 0.2s ease, box-shadow 0.2s ease;
-        line-height: 1.2;
-        margin: 0;
-        white-space: nowrap;
-    }
-    .header-cta:hover {
-        transform: scale(1.05);
-        box-shadow: 0 6px 16px rgba(0,113,227,0.4);
-        color: white !important;
-    }
-    
-    /* Adjust page content to prevent overlap */
-    .block-container {
-        padding-top: 80px !important;
-    }
-</style>
-
 <div class="custom-header">
 <div class="header-left">
 <div class="header-logo">RESUME AI</div>
@@ -1138,33 +414,6 @@ Products ▾
     # Footer Section
     st.markdown('<div style="margin: 80px 0; border-top: 1px solid #d1d1d6;"></div>', unsafe_allow_html=True)
     st.markdown("""
-    <style>
-        .footer-container {
-            background-color: #0071e3;
-            color: white;
-            padding: 60px 40px;
-            border-radius: 24px;
-            margin-bottom: 40px;
-        }
-        .footer-col-title {
-            font-weight: 600;
-            margin-bottom: 20px;
-            color: white;
-            font-size: 1.1rem;
-        }
-        .footer-link {
-            color: rgba(255, 255, 255, 0.8);
-            margin-bottom: 12px;
-            font-size: 0.9rem;
-            cursor: pointer;
-            transition: color 0.2s ease;
-            display: block;
-        }
-        .footer-link:hover {
-            color: white;
-            text-decoration: underline;
-        }
-    </style>
     <div class="footer-container">
         <div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 40px;">
             <div>
@@ -1218,134 +467,7 @@ Products ▾
 
 def login_page():
     # Custom CSS for this page to match Apple ID style
-    st.markdown("""
-        <style>
-        [data-testid="stHeader"] { display: none; }
-        .block-container { padding-top: 2rem; padding-bottom: 5rem; }
-        
-        /* Input Field Styling */
-        div[data-testid="stTextInput"] {
-            position: relative !important;
-            overflow: visible !important;
-        }
-        
-        div[data-baseweb="base-input"] {
-            overflow: visible !important;
-            background-color: transparent !important;
-            border: none !important;
-            box-shadow: none !important;
-            width: 100% !important;
-        }
-        
-        div[data-baseweb="input"] {
-            background-color: transparent !important;
-            border: none !important;
-            box-shadow: none !important;
-            width: 100% !important;
-        }
-
-        /* Move Password Toggle Button Inside */
-        button[aria-label="Show password text"] {
-            position: absolute !important;
-            right: 12px !important;
-            top: 50% !important;
-            transform: translateY(-50%) !important;
-            border: none !important;
-            background: transparent !important;
-            color: #86868b !important;
-            z-index: 5 !important;
-        }
-        button[aria-label="Show password text"]:hover {
-            color: #0071e3 !important;
-            background: transparent !important;
-        }
-        
-        /* Floating Label Styling */
-        div[data-testid="stTextInput"] label {
-            display: block !important;
-            position: absolute !important;
-            top: 18px !important;
-            left: 16px !important;
-            font-size: 17px !important;
-            color: #86868b !important;
-            pointer-events: none !important;
-            transition: all 0.2s ease !important;
-            z-index: 10 !important;
-        }
-
-        div[data-testid="stTextInput"]:focus-within label,
-        div[data-testid="stTextInput"]:has(input:not(:placeholder-shown)) label {
-            top: 6px !important;
-            font-size: 12px !important;
-        }
-        
-        .stTextInput input {
-            padding-top: 24px !important;
-            padding-bottom: 8px !important;
-            padding-left: 16px !important;
-            padding-right: 40px !important;
-            font-size: 17px !important;
-            height: 56px !important;
-            border-radius: 12px !important;
-            border: 1px solid #d2d2d7 !important;
-            line-height: 1.2 !important;
-            width: 100% !important;
-            box-sizing: border-box !important;
-        }
-        
-        .stTextInput input:focus {
-            border-color: #0071e3 !important;
-            box-shadow: 0 0 0 4px rgba(0,113,227,0.1) !important;
-        }
-        
-        /* Primary Button */
-        div[data-testid="stBaseButton-primary"] button {
-            background-color: #0071e3 !important;
-            border-radius: 12px !important;
-            padding-top: 0.8rem !important;
-            padding-bottom: 0.8rem !important;
-            font-size: 1.1rem !important;
-            font-weight: 400 !important;
-            border: none !important;
-        }
-        div[data-testid="stBaseButton-primary"] button:hover {
-            background-color: #0077ed !important;
-        }
-        
-        /* Secondary Button (Passkey) */
-        div[data-testid="stBaseButton-secondary"] button {
-            background-color: #1d1d1f !important;
-            color: white !important;
-            border-radius: 12px !important;
-            padding-top: 0.8rem !important;
-            padding-bottom: 0.8rem !important;
-            font-size: 1.1rem !important;
-            font-weight: 400 !important;
-            border: none !important;
-        }
-        div[data-testid="stBaseButton-secondary"] button:hover {
-            background-color: #2c2c2e !important;
-            color: white !important;
-            border: none !important;
-        }
-        
-        /* Link styling for buttons */
-        .create-account-btn button, .forgot-password-btn button {
-            background: none !important;
-            border: none !important;
-            color: #0071e3 !important;
-            font-size: 0.95rem !important;
-            padding: 0 !important;
-            box-shadow: none !important;
-            margin: 0 auto !important;
-            display: block !important;
-        }
-        .create-account-btn button:hover, .forgot-password-btn button:hover {
-            text-decoration: underline !important;
-            background: none !important;
-        }
-        </style>
-    """, unsafe_allow_html=True)
+    use_page_css("login")
 
 
     # Top Right Back Button
@@ -1427,100 +549,7 @@ def login_page():
 
 def register_page():
     # Custom CSS (Reuse same style as login for consistency)
-    st.markdown("""
-        <style>
-        [data-testid="stHeader"] { display: none; }
-        .block-container { padding-top: 2rem; padding-bottom: 5rem; }
-        
-        /* Input Field Styling */
-        div[data-testid="stTextInput"] {
-            position: relative !important;
-            overflow: visible !important;
-        }
-        
-        div[data-baseweb="base-input"] {
-            overflow: visible !important;
-            background-color: transparent !important;
-            border: none !important;
-            box-shadow: none !important;
-            width: 100% !important;
-        }
-        
-        div[data-baseweb="input"] {
-            background-color: transparent !important;
-            border: none !important;
-            box-shadow: none !important;
-            width: 100% !important;
-        }
-
-        /* Move Password Toggle Button Inside */
-        button[aria-label="Show password text"] {
-            position: absolute !important;
-            right: 12px !important;
-            top: 50% !important;
-            transform: translateY(-50%) !important;
-            border: none !important;
-            background: transparent !important;
-            color: #86868b !important;
-            z-index: 5 !important;
-        }
-        button[aria-label="Show password text"]:hover {
-            color: #0071e3 !important;
-            background: transparent !important;
-        }
-        
-        /* Floating Label Styling */
-        div[data-testid="stTextInput"] label {
-            display: block !important;
-            position: absolute !important;
-            top: 18px !important;
-            left: 16px !important;
-            font-size: 17px !important;
-            color: #86868b !important;
-            pointer-events: none !important;
-            transition: all 0.2s ease !important;
-            z-index: 10 !important;
-        }
-
-        div[data-testid="stTextInput"]:focus-within label,
-        div[data-testid="stTextInput"]:has(input:not(:placeholder-shown)) label {
-            top: 6px !important;
-            font-size: 12px !important;
-        }
-        
-        .stTextInput input {
-            padding-top: 24px !important;
-            padding-bottom: 8px !important;
-            padding-left: 16px !important;
-            padding-right: 40px !important;
-            font-size: 17px !important;
-            height: 56px !important;
-            border-radius: 12px !important;
-            border: 1px solid #d2d2d7 !important;
-            line-height: 1.2 !important;
-            width: 100% !important;
-            box-sizing: border-box !important;
-        }
-        
-        .stTextInput input:focus {
-            border-color: #0071e3 !important;
-            box-shadow: 0 0 0 4px rgba(0,113,227,0.1) !important;
-        }
-        
-        div[data-testid="stBaseButton-primary"] button {
-            background-color: #0071e3 !important;
-            border-radius: 12px !important;
-            padding-top: 0.8rem !important;
-            padding-bottom: 0.8rem !important;
-            font-size: 1.1rem !important;
-            font-weight: 400 !important;
-            border: none !important;
-        }
-        div[data-testid="stBaseButton-primary"] button:hover {
-            background-color: #0077ed !important;
-        }
-        </style>
-    """, unsafe_allow_html=True)
+    use_page_css("register")
 
     # Spacer
     st.markdown("<div style='height: 8vh;'></div>", unsafe_allow_html=True)
@@ -1576,7 +605,46 @@ def register_page():
         </div>
     """, unsafe_allow_html=True)
 
+# --- BUILDER JOB CARDS ---
+# Each card is a fragment: typing in it reruns only that card, not the tabs around it.
+# (st.fragment, st.experimental_fragment on older Streamlit, plain function before that)
+fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda fn: fn)
+JOB_FIELD_KEYS = ("r", "c", "d", "l", "t", "s", "del")
+
+def rerun_fragment():
+    try:
+        st.rerun(scope="fragment")
+    except (TypeError, StreamlitAPIException):
+        # No fragment support, or not inside a fragment rerun
+        st.rerun()
+
+@fragment
+def job_card(job, position):
+    jobs = st.session_state.resume_data["jobs"]
+    if not any(j is job for j in jobs):
+        return  # deleted: the fragment renders nothing until the next full rerun drops it
+    uid = id(job)  # stable while the job lives in session_state, unlike its list index
+    title = f"{job.role} @ {job.company}" if job.role else f"Position {position+1}"
+    with st.expander(title, expanded=True):
+        col1, col2 = st.columns(2)
+        job.role = col1.text_input("Role", value=job.role, key=f"r{uid}", placeholder="Role Title")
+        job.company = col2.text_input("Company", value=job.company, key=f"c{uid}", placeholder="Company Name")
+        
+        col3, col4 = st.columns(2)
+        job.duration = col3.text_input("Dates", value=job.duration, key=f"d{uid}", placeholder="Dates")
+        job.location = col4.text_input("Location", value=job.location, key=f"l{uid}", placeholder="City")
+        
+        job.tech_stack = st.text_input("Tech Stack", value=job.tech_stack, key=f"t{uid}", placeholder="Tools used...")
+        job.summary_input = st.text_area("Tasks", value=job.summary_input, height=100, key=f"s{uid}", placeholder="What did you do?")
+        
+        if st.checkbox("Delete", key=f"del{uid}"):
+            st.session_state.resume_data["jobs"] = [j for j in jobs if j is not job]
+            for prefix in JOB_FIELD_KEYS:
+                st.session_state.pop(f"{prefix}{uid}", None)
+            rerun_fragment()
+
 def main_app():
+    use_page_css(None)  # page-specific CSS (landing/login/register) does not apply here
     # Check if logged in
     if not st.session_state.logged_in:
         st.warning("Please log in to access the application.")
@@ -1589,7 +657,7 @@ def main_app():
             st.error("⚠️ OPENROUTER_API_KEY not found! Please check your .env file.")
             st.stop()
         else:
-            st.session_state.agent = backend.ResumeAgent()
+            st.session_state.agent = get_agent()
 
     # --- Header with Logout ---
     c_back, c_title, c_user = st.columns([1, 6, 2])
@@ -1621,7 +689,7 @@ def main_app():
                 jd_text = st.text_area("jd", height=100, label_visibility="collapsed", placeholder="Paste the JD here for keyword matching...")
             with c3:
                 st.markdown("**Auto-Fill**")
-                uploaded_file = st.file_uploader("upload", type=["pdf"], label_visibility="collapsed")
+                uploaded_file = st.file_uploader("upload", type=["pdf", "docx"], label_visibility="collapsed")
     
     # Check for pending upload from landing page
     if "pending_upload" in st.session_state:
@@ -1632,8 +700,7 @@ def main_app():
     if uploaded_file is not None and "file_processed" not in st.session_state:
         with st.status("Reading document...", expanded=True) as status:
             try:
-                raw_text = backend.extract_text_from_pdf(uploaded_file)
-                parsed_data = st.session_state.agent.parse_resume_text(raw_text)
+                raw_text, parsed_data = backend.parse_uploaded_resume(st.session_state.agent, uploaded_file)
                 
                 st.session_state.resume_data["full_name"] = parsed_data.full_name
                 st.session_state.resume_data["contact"] = parsed_data.contact_info
@@ -1683,28 +750,9 @@ def main_app():
                     st.session_state.resume_data["jobs"].insert(0, backend.ExperienceItem())
                     st.rerun()
     
-            # Job Cards
-            jobs_to_keep = []
-            for i, job in enumerate(st.session_state.resume_data["jobs"]):
-                title = f"{job.role} @ {job.company}" if job.role else f"Position {i+1}"
-                with st.expander(title, expanded=True):
-                    col1, col2 = st.columns(2)
-                    job.role = col1.text_input("Role", value=job.role, key=f"r{i}", placeholder="Role Title")
-                    job.company = col2.text_input("Company", value=job.company, key=f"c{i}", placeholder="Company Name")
-                    
-                    col3, col4 = st.columns(2)
-                    job.duration = col3.text_input("Dates", value=job.duration, key=f"d{i}", placeholder="Dates")
-                    job.location = col4.text_input("Location", value=job.location, key=f"l{i}", placeholder="City")
-                    
-                    job.tech_stack = st.text_input("Tech Stack", value=job.tech_stack, key=f"t{i}", placeholder="Tools used...")
-                    job.summary_input = st.text_area("Tasks", value=job.summary_input, height=100, key=f"s{i}", placeholder="What did you do?")
-                    
-                    if not st.checkbox("Delete", key=f"del{i}"):
-                        jobs_to_keep.append(job)
-    
-            if len(jobs_to_keep) != len(st.session_state.resume_data["jobs"]):
-                st.session_state.resume_data["jobs"] = jobs_to_keep
-                st.rerun()
+            # Job Cards (fragments; edits and deletes rerun only the card)
+            for i, job in enumerate(list(st.session_state.resume_data["jobs"])):
+                job_card(job, i)
     
             # --- GENERATION AREA ---
             st.markdown("---")
@@ -1720,13 +768,18 @@ def main_app():
                 else:
                     with st.status("Architecting Resume...", expanded=True) as s:
                         try:
-                            # 1. AI Logic
-                            enhanced_jobs = st.session_state.agent.rewrite_all_jobs(
-                                st.session_state.resume_data["jobs"], 
-                                target_role, 
-                                jd_text, 
-                                tone_sel
-                            )
+                            # 1. AI Logic (bullets show up per job as they stream in)
+                            jobs = st.session_state.resume_data["jobs"]
+                            live, streamed = {}, {}
+                            for i, bullet in st.session_state.agent.stream_rewrite_all_jobs(jobs, target_role, jd_text, tone_sel):
+                                if i not in live:
+                                    live[i], streamed[i] = st.empty(), []
+                                streamed[i].append(bullet)
+                                live[i].markdown(f"**{jobs[i].role or f'Position {i+1}'}**\n" + "\n".join(f"- {b}" for b in streamed[i]))
+                            # Show the final bullets: the verb dedupe pass may have changed what streamed in
+                            for i, box in live.items():
+                                box.markdown(f"**{jobs[i].role or f'Position {i+1}'}**\n" + "\n".join(f"- {b}" for b in jobs[i].enhanced_bullets))
+                            enhanced_jobs = list(jobs)
                             
                             # 2. Compile
                             try: final_skills = eval(skills_input)
@@ -1738,8 +791,8 @@ def main_app():
                                 skills=final_skills, experience=enhanced_jobs
                             )
                             
-                            # 3. Render
-                            fpath = backend.create_styled_resume(resume_obj)
+                            # 3. Render (in memory, so concurrent sessions never share a file)
+                            docx_bytes = backend.render_resume_bytes(resume_obj)
                             s.update(label="Done", state="complete", expanded=False)
                             
                             # 4. Success UI
@@ -1747,8 +800,7 @@ def main_app():
                             
                             c_dl, c_stat = st.columns(2)
                             with c_dl:
-                                with open(fpath, "rb") as f:
-                                    st.download_button("📥 Download .DOCX", f, file_name="Resume.docx", use_container_width=True)
+                                st.download_button("📥 Download .DOCX", docx_bytes, file_name="Resume.docx", use_container_width=True)
                             
                             # 5. ATS Score
                             if jd_text:
@@ -1773,7 +825,7 @@ def main_app():
         col_ats_left, col_ats_right = st.columns([1, 1])
         
         with col_ats_left:
-            ats_file = st.file_uploader("Upload Resume (PDF) to Check", type=["pdf"], key="ats_upload")
+            ats_file = st.file_uploader("Upload Resume (PDF or DOCX) to Check", type=["pdf", "docx"], key="ats_upload")
             
         with col_ats_right:
             st.markdown("**Job Description**")
@@ -1793,10 +845,9 @@ def main_app():
                 if ats_file:
                     with st.spinner("Parsing uploaded resume..."):
                         try:
-                            raw_text_ats = backend.extract_text_from_pdf(ats_file)
-                            resume_obj_to_check = st.session_state.agent.parse_resume_text(raw_text_ats)
+                            raw_text_ats, resume_obj_to_check = backend.parse_uploaded_resume(st.session_state.agent, ats_file)
                         except Exception as e:
-                            st.error(f"Error parsing PDF: {e}")
+                            st.error(f"Error parsing resume: {e}")
                 else:
                     # Use workspace data
                     try:
@@ -1856,20 +907,22 @@ def main_app():
             if st.button("📝 Draft Letter"):
                 if not jd_text: st.warning("Paste a JD above first.")
                 else:
-                    with st.spinner("Writing..."):
-                        try:
-                            # Simple Compile
-                            try: fs = eval(skills_input)
-                            except: fs = {"Skills": skills_input}
-                            res_sim = backend.ResumeData(
-                                full_name=full_name, contact_info=contact,
-                                education=[{"school": education_str}], skills=fs,
-                                experience=st.session_state.resume_data["jobs"]
-                            )
-                            cl_text = st.session_state.agent.generate_cover_letter(res_sim, jd_text)
-                            st.text_area("Draft", value=cl_text, height=400)
+                    try:
+                        # Simple Compile
+                        try: fs = eval(skills_input)
+                        except: fs = {"Skills": skills_input}
+                        res_sim = backend.ResumeData(
+                            full_name=full_name, contact_info=contact,
+                            education=[{"school": education_str}], skills=fs,
+                            experience=st.session_state.resume_data["jobs"]
+                        )
+                        # Streamed token by token instead of behind a spinner
+                        cl_text = st.write_stream(st.session_state.agent.stream_cover_letter(res_sim, jd_text))
+                        if cl_text:
                             st.download_button("📥 Download", cl_text, "CoverLetter.txt")
-                        except Exception as e: st.error(e)
+                        else:
+                            st.error("Could not draft a cover letter. Try again.")
+                    except Exception as e: st.error(e)
 
 # --- MAIN EXECUTION ---
 if st.session_state.page == "landing":
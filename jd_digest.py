@@ -0,0 +1,60 @@
+import re
+from functools import lru_cache
+from typing import List
+
+from pydantic import BaseModel, Field
+
+import ats_engine
+
+DIGEST_MAX_REQUIREMENTS = 15
+DIGEST_MAX_KEYWORDS = 25
+
+class JDDigest(BaseModel):
+    requirements: List[str] = Field(default_factory=list)  # de-duplicated requirement sentences/bullets
+    keywords: List[str] = Field(default_factory=list)  # top weighted JD terms (ats_engine)
+    source_chars: int = 0
+
+    def render(self) -> str:
+        """Compact prompt block used in place of the raw JD."""
+        parts = []
+        if self.requirements:
+            parts.append("KEY REQUIREMENTS:\n" + "\n".join(f"- {r}" for r in self.requirements))
+        if self.keywords:
+            parts.append("KEYWORDS: " + ", ".join(self.keywords))
+        return "\n".join(parts)
+
+
+def strip_boilerplate(jd_text: str) -> List[str]:
+    """Sentences/bullets of the JD minus boilerplate sections and sentences, de-duplicated in order."""
+    kept = []
+    seen = set()
+    for sentence in ats_engine.jd_sentences(jd_text):
+        key = re.sub(r"[^a-z0-9+#]+", " ", sentence.lower()).strip()
+        if len(key) < 4 or key in seen:
+            continue
+        seen.add(key)
+        kept.append(sentence)
+    return kept
+
+
+def build_digest(jd_text: str) -> JDDigest:
+    sentences = strip_boilerplate(jd_text)
+    profile = ats_engine.build_jd_profile(jd_text)  # strips the same boilerplate itself
+    weights = profile.terms
+    # Sentences carrying the most JD weight are the requirements worth keeping
+    scored = [
+        (sum(weights.get(term, 0.0) for term in set(ats_engine.ngrams(ats_engine.tokenize(s)))), i, s)
+        for i, s in enumerate(sentences)
+    ]
+    top = sorted(sorted(scored, key=lambda item: -item[0])[:DIGEST_MAX_REQUIREMENTS], key=lambda item: item[1])
+    return JDDigest(
+        requirements=[s for score, _, s in top if score > 0],
+        keywords=list(weights)[:DIGEST_MAX_KEYWORDS],
+        source_chars=len(jd_text),
+    )
+
+
+@lru_cache(maxsize=256)
+def get_jd_digest(jd_text: str) -> JDDigest:
+    """Memoized build_digest: computed once per JD and shared by every prompt. Treat as read-only."""
+    return build_digest(jd_text)
@@ -0,0 +1,242 @@
+import re
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List
+
+import numpy as np
+from pydantic import BaseModel
+
+import ats_engine
+import jd_digest
+
+JD_DB_NAME = "jd_library.db"
+NUM_PERM = 64
+LSH_BANDS = 8  # 8 bands x 8 rows: pairs above ~0.77 Jaccard are almost always candidates
+NEAR_DUP_THRESHOLD = 0.8
+SHINGLE_SIZE = 5
+MIN_IDF_DOCS = 20  # below this the corpus is too small for IDF to mean anything
+USES_FLUSH_EVERY = 32  # in-memory hits are counted and written back in batches
+
+# --- NORMALIZATION ---
+def normalize_jd(jd_text: str) -> str:
+    """Case, punctuation and whitespace-insensitive form used to spot re-posted JDs."""
+    text = re.sub(r"[^\w+#/.]+", " ", jd_text.lower())
+    return re.sub(r"\s+", " ", text).strip()
+
+def jd_hash(jd_text: str) -> str:
+    return hashlib.sha256(normalize_jd(jd_text).encode()).hexdigest()
+
+# --- MINHASH ---
+_MERSENNE = (1 << 31) - 1
+_rng = np.random.RandomState(1872)
+_PERM_A = _rng.randint(1, _MERSENNE, size=NUM_PERM).astype(np.uint64)
+_PERM_B = _rng.randint(0, _MERSENNE, size=NUM_PERM).astype(np.uint64)
+
+def minhash(normalized: str) -> np.ndarray:
+    """MinHash signature over word shingles of a normalized JD."""
+    words = normalized.split()
+    shingles = {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(max(1, len(words) - SHINGLE_SIZE + 1))}
+    hashes = np.array(
+        [int.from_bytes(hashlib.blake2b(s.encode(), digest_size=4).digest(), "little") % _MERSENNE for s in shingles],
+        dtype=np.uint64,
+    )
+    return ((_PERM_A[:, None] * hashes[None, :] + _PERM_B[:, None]) % _MERSENNE).min(axis=1)
+
+def lsh_buckets(signature: np.ndarray) -> List[str]:
+    rows = NUM_PERM // LSH_BANDS
+    return [hashlib.md5(signature[b * rows:(b + 1) * rows].tobytes()).hexdigest() for b in range(LSH_BANDS)]
+
+def estimated_jaccard(a: np.ndarray, b: np.ndarray) -> float:
+    return float(np.mean(a == b))
+
+# --- ENTRIES ---
+class JDEntry(BaseModel):
+    id: int
+    hash: str
+    keywords: List[str]
+    profile: ats_engine.JDProfile  # TF-IDF weighted terms used by the ATS scorer
+    digest: jd_digest.JDDigest
+    near_duplicate: bool = False  # matched an existing entry through LSH rather than its exact hash
+
+
+class JDLibrary:
+    """
+    Persistent store of every JD seen, keyed by the hash of its normalized text. Each entry keeps its
+    keywords, TF-IDF profile and prompt digest, so a repeat JD skips all preprocessing. Re-posts that
+    differ slightly are matched with MinHash/LSH and share the original entry.
+    """
+
+    def __init__(self, db_name: str = JD_DB_NAME, memory_entries: int = 256):
+        self.db_name = db_name
+        self.memory_entries = memory_entries
+        self._memory = OrderedDict()  # normalized hash -> JDEntry
+        self._pending_uses = {}  # jd id -> [hits served from memory, last hit time] not yet in the DB
+        self._lock = threading.Lock()
+        conn = sqlite3.connect(self.db_name)
+        conn.executescript('''
+            CREATE TABLE IF NOT EXISTS jds (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                hash TEXT UNIQUE NOT NULL,
+                keywords TEXT NOT NULL,
+                profile TEXT NOT NULL,
+                digest TEXT NOT NULL,
+                signature BLOB NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL,
+                uses INTEGER NOT NULL DEFAULT 1
+            );
+            CREATE TABLE IF NOT EXISTS jd_aliases (hash TEXT PRIMARY KEY, jd_id INTEGER NOT NULL);
+            CREATE TABLE IF NOT EXISTS jd_bands (
+                band INTEGER NOT NULL, bucket TEXT NOT NULL, jd_id INTEGER NOT NULL,
+                PRIMARY KEY (band, bucket, jd_id)
+            );
+            CREATE TABLE IF NOT EXISTS jd_terms (term TEXT NOT NULL, jd_id INTEGER NOT NULL, PRIMARY KEY (term, jd_id));
+        ''')
+        conn.commit()
+        conn.close()
+
+    def _connect(self):
+        return sqlite3.connect(self.db_name, timeout=5)
+
+    def _row_to_entry(self, row, near_duplicate: bool = False) -> JDEntry:
+        jd_id, digest_hash, keywords, profile, digest = row
+        return JDEntry(
+            id=jd_id, hash=digest_hash, keywords=json.loads(keywords),
+            profile=ats_engine.JDProfile.model_validate_json(profile),
+            digest=jd_digest.JDDigest.model_validate_json(digest),
+            near_duplicate=near_duplicate,
+        )
+
+    def _remember(self, key: str, entry: JDEntry):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _count_use(self, jd_id: int, now: float):
+        pending = self._pending_uses.setdefault(jd_id, [0, now])
+        pending[0] += 1
+        pending[1] = now
+        if sum(hits for hits, _ in self._pending_uses.values()) >= USES_FLUSH_EVERY:
+            conn = self._connect()
+            try:
+                self._flush_uses(conn)
+            finally:
+                conn.close()
+
+    def _flush_uses(self, conn):
+        if not self._pending_uses:
+            return
+        conn.executemany('UPDATE jds SET uses = uses + ?, last_used = MAX(last_used, ?) WHERE id = ?',
+                         [(hits, last_used, jd_id) for jd_id, (hits, last_used) in self._pending_uses.items()])
+        conn.commit()
+        self._pending_uses.clear()
+
+    def _find(self, conn, key: str, signature: np.ndarray):
+        row = conn.execute(
+            'SELECT j.id, j.hash, j.keywords, j.profile, j.digest FROM jd_aliases a JOIN jds j ON j.id = a.jd_id '
+            'WHERE a.hash = ?', (key,)).fetchone()
+        if row is not None:
+            return row, False
+        candidates = set()
+        for band, bucket in enumerate(lsh_buckets(signature)):
+            candidates.update(r[0] for r in conn.execute(
+                'SELECT jd_id FROM jd_bands WHERE band = ? AND bucket = ?', (band, bucket)))
+        best, best_score = None, NEAR_DUP_THRESHOLD
+        for jd_id in candidates:
+            stored = conn.execute('SELECT signature FROM jds WHERE id = ?', (jd_id,)).fetchone()
+            score = estimated_jaccard(signature, np.frombuffer(stored[0], dtype=np.uint64))
+            if score >= best_score:
+                best, best_score = jd_id, score
+        if best is None:
+            return None, False
+        row = conn.execute('SELECT id, hash, keywords, profile, digest FROM jds WHERE id = ?', (best,)).fetchone()
+        return row, True
+
+    def _doc_freq(self, conn, terms: List[str]):
+        """(term -> number of stored JDs containing it, number of stored JDs)."""
+        n_docs = conn.execute('SELECT COUNT(*) FROM jds').fetchone()[0]
+        freq = {}
+        for term in terms:
+            freq[term] = conn.execute('SELECT COUNT(*) FROM jd_terms WHERE term = ?', (term,)).fetchone()[0]
+        return freq, n_docs
+
+    def get(self, jd_text: str) -> JDEntry:
+        """The library entry for `jd_text`, creating it (digest, keywords, TF-IDF profile) on first sight."""
+        normalized = normalize_jd(jd_text)
+        key = hashlib.sha256(normalized.encode()).hexdigest()
+        with self._lock:
+            now = time.time()
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                entry = self._memory[key]
+                self._count_use(entry.id, now)
+                return entry
+            conn = self._connect()
+            try:
+                self._flush_uses(conn)
+                signature = minhash(normalized)
+                row, near_duplicate = self._find(conn, key, signature)
+                if row is not None:
+                    conn.execute('INSERT OR IGNORE INTO jd_aliases (hash, jd_id) VALUES (?, ?)', (key, row[0]))
+                    conn.execute('UPDATE jds SET last_used = ?, uses = uses + 1 WHERE id = ?', (now, row[0]))
+                    conn.commit()
+                    entry = self._row_to_entry(row, near_duplicate)
+                else:
+                    entry = self._insert(conn, key, jd_text, signature, now)
+            finally:
+                conn.close()
+            self._remember(key, entry)
+            return entry
+
+    def _insert(self, conn, key: str, jd_text: str, signature: np.ndarray, now: float) -> JDEntry:
+        digest = jd_digest.get_jd_digest(jd_text)
+        # extract_jd_terms/build_jd_profile drop boilerplate themselves (ats_engine.jd_sentences), like the digest
+        terms = list(ats_engine.extract_jd_terms(jd_text))
+        doc_freq, n_docs = self._doc_freq(conn, terms)
+        if n_docs >= MIN_IDF_DOCS:
+            profile = ats_engine.build_jd_profile(jd_text, doc_freq=doc_freq, n_docs=n_docs)
+        else:
+            profile = ats_engine.get_jd_profile(jd_text)
+        cursor = conn.execute(
+            'INSERT INTO jds (hash, keywords, profile, digest, signature, created_at, last_used) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (key, json.dumps(digest.keywords), profile.model_dump_json(), digest.model_dump_json(),
+             signature.astype(np.uint64).tobytes(), now, now),
+        )
+        jd_id = cursor.lastrowid
+        conn.execute('INSERT OR IGNORE INTO jd_aliases (hash, jd_id) VALUES (?, ?)', (key, jd_id))
+        conn.executemany('INSERT OR IGNORE INTO jd_bands (band, bucket, jd_id) VALUES (?, ?, ?)',
+                         [(band, bucket, jd_id) for band, bucket in enumerate(lsh_buckets(signature))])
+        conn.executemany('INSERT OR IGNORE INTO jd_terms (term, jd_id) VALUES (?, ?)', [(t, jd_id) for t in terms])
+        conn.commit()
+        return JDEntry(id=jd_id, hash=key, keywords=digest.keywords, profile=profile, digest=digest)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            conn = self._connect()
+            try:
+                self._flush_uses(conn)
+                return {
+                    "entries": conn.execute('SELECT COUNT(*) FROM jds').fetchone()[0],
+                    "aliases": conn.execute('SELECT COUNT(*) FROM jd_aliases').fetchone()[0],
+                    "uses": conn.execute('SELECT COALESCE(SUM(uses), 0) FROM jds').fetchone()[0],
+                    "memory_entries": len(self._memory),
+                }
+            finally:
+                conn.close()
+
+
+_default_library = None
+_default_lock = threading.Lock()
+
+def get_default_jd_library() -> JDLibrary:
+    global _default_library
+    with _default_lock:
+        if _default_library is None:
+            _default_library = JDLibrary()
+        return _default_library
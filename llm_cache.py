@@ -0,0 +1,309 @@
+import sqlite3
+import hashlib
+import json
+import threading
+import time
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Optional
+
+CACHE_DB_NAME = "llm_cache.db"
+
+def make_cache_key(model: str, system_prompt: str, user_prompt: str, response_format=None) -> str:
+    """Content hash of everything that determines an LLM response."""
+    payload = json.dumps(
+        [model, system_prompt, user_prompt, response_format],
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+# --- TIERS ---
+class MemoryCache:
+    """Thread-safe in-process LRU with a per-entry TTL."""
+
+    def __init__(self, max_entries: int = 512, ttl: Optional[float] = 24 * 3600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, created_at = item
+            if self.ttl is not None and time.time() - created_at > self.ttl:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, created_at: Optional[float] = None):
+        with self._lock:
+            self._data[key] = (value, created_at if created_at is not None else time.time())
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class SQLiteCache:
+    """Persistent key/value tier. Evicts by TTL and keeps at most `max_entries` rows (least recently used first)."""
+
+    def __init__(self, db_name: str = CACHE_DB_NAME, table: str = "llm_cache",
+                 max_entries: int = 10000, ttl: Optional[float] = 7 * 24 * 3600):
+        if not table.isidentifier():
+            raise ValueError(f"Invalid table name: {table}")
+        self.db_name = db_name
+        self.table = table
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._writes = 0
+        conn = sqlite3.connect(self.db_name)
+        conn.execute(f'''
+            CREATE TABLE IF NOT EXISTS {self.table} (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        ''')
+        conn.execute(f'CREATE INDEX IF NOT EXISTS idx_{self.table}_access ON {self.table} (last_access)')
+        conn.commit()
+        conn.close()
+
+    def _connect(self):
+        return sqlite3.connect(self.db_name, timeout=5)
+
+    def get_with_age(self, key: str):
+        """Returns (value, created_at) or None."""
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            try:
+                row = conn.execute(f'SELECT value, created_at FROM {self.table} WHERE key = ?', (key,)).fetchone()
+                if row is None:
+                    return None
+                if self.ttl is not None and now - row[1] > self.ttl:
+                    conn.execute(f'DELETE FROM {self.table} WHERE key = ?', (key,))
+                    conn.commit()
+                    return None
+                conn.execute(f'UPDATE {self.table} SET last_access = ? WHERE key = ?', (now, key))
+                conn.commit()
+                return row[0], row[1]
+            finally:
+                conn.close()
+
+    def get(self, key: str) -> Optional[str]:
+        found = self.get_with_age(key)
+        return found[0] if found else None
+
+    def set(self, key: str, value: str):
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            try:
+                conn.execute(
+                    f'INSERT OR REPLACE INTO {self.table} (key, value, created_at, last_access) VALUES (?, ?, ?, ?)',
+                    (key, value, now, now),
+                )
+                self._writes += 1
+                # Amortize eviction instead of counting rows on every write
+                if self._writes % 100 == 1:
+                    self._evict(conn, now)
+                conn.commit()
+            finally:
+                conn.close()
+
+    def _evict(self, conn, now: float):
+        if self.ttl is not None:
+            conn.execute(f'DELETE FROM {self.table} WHERE created_at < ?', (now - self.ttl,))
+        conn.execute(f'''
+            DELETE FROM {self.table} WHERE key IN (
+                SELECT key FROM {self.table} ORDER BY last_access DESC LIMIT -1 OFFSET ?
+            )
+        ''', (self.max_entries,))
+
+    def delete(self, key: str):
+        with self._lock:
+            conn = self._connect()
+            try:
+                conn.execute(f'DELETE FROM {self.table} WHERE key = ?', (key,))
+                conn.commit()
+            finally:
+                conn.close()
+
+    def clear(self):
+        with self._lock:
+            conn = self._connect()
+            try:
+                conn.execute(f'DELETE FROM {self.table}')
+                conn.commit()
+            finally:
+                conn.close()
+
+# --- TIERED CACHE ---
+class LLMCache:
+    """Memory LRU in front of an optional SQLite tier, with hit/miss counters."""
+
+    def __init__(self, memory: Optional[MemoryCache] = None, persistent: Optional[SQLiteCache] = None):
+        self.memory = memory if memory is not None else MemoryCache()
+        self.persistent = persistent
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.memory_hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.memory.get(key)
+        if value is not None:
+            with self._lock:
+                self.hits += 1
+                self.memory_hits += 1
+            return value
+        if self.persistent is not None:
+            found = self.persistent.get_with_age(key)
+            if found is not None:
+                value, created_at = found
+                # Promote, keeping the original age so the TTL still applies
+                self.memory.set(key, value, created_at=created_at)
+                with self._lock:
+                    self.hits += 1
+                return value
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key: str, value: str):
+        self.memory.set(key, value)
+        if self.persistent is not None:
+            self.persistent.set(key, value)
+
+    def delete(self, key: str):
+        self.memory.delete(key)
+        if self.persistent is not None:
+            self.persistent.delete(key)
+
+    def clear(self):
+        self.memory.clear()
+        if self.persistent is not None:
+            self.persistent.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "memory_hits": self.memory_hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "memory_entries": len(self.memory),
+            }
+
+
+class NullCache:
+    """Drop-in cache that never stores anything (disables caching)."""
+
+    def get(self, key: str) -> Optional[str]:
+        return None
+
+    def set(self, key: str, value: str):
+        pass
+
+    def delete(self, key: str):
+        pass
+
+    def clear(self):
+        pass
+
+    def stats(self) -> dict:
+        return {"hits": 0, "memory_hits": 0, "misses": 0, "hit_rate": 0.0, "memory_entries": 0}
+
+
+class SingleFlight:
+    """
+    Collapses concurrent identical requests: the first caller for a key runs it, callers that
+    arrive while it is in flight wait for and share its result (or exception).
+    Backed by concurrent.futures.Future, so threads and coroutines on any loop can share a flight.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.shared = 0  # calls answered by another caller's request
+
+    def _join(self, key: str):
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.shared += 1
+                return future, False
+            future = self._calls[key] = Future()
+            return future, True
+
+    def _finish(self, key: str, future: Future, result=None, error: BaseException = None):
+        with self._lock:
+            self._calls.pop(key, None)
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def do(self, key: str, fn):
+        future, leader = self._join(key)
+        if not leader:
+            return future.result()
+        try:
+            result = fn()
+        except BaseException as e:
+            self._finish(key, future, error=e)
+            raise
+        self._finish(key, future, result)
+        return result
+
+    async def do_async(self, key: str, request):
+        """Like do(), for `request()` returning an awaitable."""
+        future, leader = self._join(key)
+        if not leader:
+            # shield: a cancelled follower must not cancel the shared future
+            return await asyncio.shield(asyncio.wrap_future(future))
+        try:
+            result = await request()
+        except BaseException as e:
+            self._finish(key, future, error=e)
+            raise
+        self._finish(key, future, result)
+        return result
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+def get_default_cache() -> LLMCache:
+    """Process-wide cache shared by every agent (memory + llm_cache.db)."""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = LLMCache(persistent=SQLiteCache())
+        return _default_cache
+
+
+_single_flight = SingleFlight()
+
+def get_single_flight() -> SingleFlight:
+    """Process-wide in-flight request table shared by every agent (sync and async)."""
+    return _single_flight
@@ -0,0 +1,147 @@
+import os
+import time
+import random
+import asyncio
+import threading
+from typing import Optional
+
+import openai
+
+# --- LIMITS (process-wide, override via environment) ---
+REQUESTS_PER_MINUTE = float(os.getenv("RESUMEAI_RPM", "60"))
+TOKENS_PER_MINUTE = float(os.getenv("RESUMEAI_TPM", "200000"))
+MAX_RETRIES = int(os.getenv("RESUMEAI_MAX_RETRIES", "4"))
+BACKOFF_BASE = float(os.getenv("RESUMEAI_BACKOFF_BASE", "0.5"))
+BACKOFF_MAX = float(os.getenv("RESUMEAI_BACKOFF_MAX", "20"))
+REQUEST_TIMEOUT = float(os.getenv("RESUMEAI_REQUEST_TIMEOUT", "60"))
+OUTPUT_TOKEN_ALLOWANCE = 800  # reserved per call for the completion before usage is known
+
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+# --- TOKEN BUCKET ---
+class TokenBucket:
+    """
+    Refills at `rate_per_minute`, holding at most `capacity` (default: one minute's worth).
+    reserve() debits immediately and returns how long the caller must wait before using it,
+    so the same bucket works for threads (time.sleep) and coroutines (asyncio.sleep).
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: float = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self.level = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float = 1.0) -> float:
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+            self.updated = now
+            # Oversized requests still go through, they just drain the bucket fully
+            self.level -= min(amount, self.capacity)
+            return 0.0 if self.level >= 0 else -self.level / self.rate
+
+    def adjust(self, amount: float):
+        """Credits back (positive) or charges extra (negative) once real usage is known."""
+        with self._lock:
+            self.level = min(self.capacity, self.level + amount)
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute buckets checked together before each call."""
+
+    def __init__(self, requests_per_minute: float = REQUESTS_PER_MINUTE, tokens_per_minute: float = TOKENS_PER_MINUTE):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+
+    def reserve(self, tokens: int) -> float:
+        return max(self.requests.reserve(1), self.tokens.reserve(tokens))
+
+    def acquire(self, tokens: int):
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: int):
+        wait = self.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def settle(self, estimated: int, usage) -> None:
+        """Corrects the token bucket with the completion's reported usage, if any."""
+        total = getattr(usage, "total_tokens", None)
+        if total:
+            self.tokens.adjust(estimated - total)
+
+
+def estimate_tokens(*texts: str) -> int:
+    # ~4 characters per token for English prose, plus room for the reply
+    return sum(len(text or "") for text in texts) // 4 + OUTPUT_TOKEN_ALLOWANCE
+
+# --- RETRY POLICY ---
+def is_retryable(exc: Exception) -> bool:
+    if isinstance(exc, (openai.RateLimitError, openai.APITimeoutError, openai.APIConnectionError,
+                        openai.InternalServerError)):
+        return True
+    return isinstance(exc, openai.APIStatusError) and exc.status_code in RETRYABLE_STATUS
+
+
+def backoff_delay(attempt: int, exc: Exception = None) -> float:
+    """Full-jitter exponential backoff; a provider Retry-After header wins when present."""
+    response = getattr(exc, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    try:
+        if retry_after is not None:
+            return min(BACKOFF_MAX, float(retry_after))
+    except ValueError:
+        pass
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+
+def call_with_retry(request, tokens: int, limiter: Optional[RateLimiter] = None, max_retries: int = MAX_RETRIES):
+    """
+    Runs `request()` (a chat completion call) under the rate limiter, retrying retryable
+    errors with backoff. Non-retryable errors and the last failure are raised to the caller.
+    """
+    limiter = limiter if limiter is not None else get_default_limiter()
+    for attempt in range(max_retries + 1):
+        limiter.acquire(tokens)
+        try:
+            result = request()
+        except Exception as e:
+            if attempt == max_retries or not is_retryable(e):
+                raise
+            time.sleep(backoff_delay(attempt, e))
+            continue
+        limiter.settle(tokens, getattr(result, "usage", None))
+        return result
+
+
+async def acall_with_retry(request, tokens: int, limiter: Optional[RateLimiter] = None, max_retries: int = MAX_RETRIES):
+    """call_with_retry for coroutines: `request()` returns an awaitable."""
+    limiter = limiter if limiter is not None else get_default_limiter()
+    for attempt in range(max_retries + 1):
+        await limiter.acquire_async(tokens)
+        try:
+            result = await request()
+        except Exception as e:
+            if attempt == max_retries or not is_retryable(e):
+                raise
+            await asyncio.sleep(backoff_delay(attempt, e))
+            continue
+        limiter.settle(tokens, getattr(result, "usage", None))
+        return result
+
+
+_default_limiter = None
+_default_lock = threading.Lock()
+
+def get_default_limiter() -> RateLimiter:
+    global _default_limiter
+    with _default_lock:
+        if _default_limiter is None:
+            _default_limiter = RateLimiter()
+        return _default_limiter
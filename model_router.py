@@ -0,0 +1,75 @@
+import os
+import json
+import threading
+from typing import Dict, List, Optional
+
+TASKS = ("parse", "audit", "rewrite", "cover_letter")
+ROUTES_FILE = os.getenv("RESUMEAI_MODEL_ROUTES", "model_routes.json")
+
+def _as_chain(value) -> List[str]:
+    if isinstance(value, str):
+        value = value.split(",")
+    return [model.strip() for model in value if model and model.strip()]
+
+def load_routes(path: str = ROUTES_FILE) -> Dict[str, List[str]]:
+    """
+    Task -> ordered model chain (first is preferred, the rest are fallbacks).
+    Read from the JSON file at `path` ({"parse": ["fast-model", "backup"], ...}), then overridden
+    per task by RESUMEAI_MODEL_<TASK> ("model-a,model-b"). Tasks without a route use the agent's model.
+    """
+    routes = {}
+    if path and os.path.exists(path):
+        try:
+            with open(path) as f:
+                routes = {task: _as_chain(chain) for task, chain in json.load(f).items()}
+        except (OSError, ValueError) as e:
+            print(f"Ignoring model routes file {path}: {e}")
+    for task in TASKS:
+        chain = _as_chain(os.getenv(f"RESUMEAI_MODEL_{task.upper()}", ""))
+        if chain:
+            routes[task] = chain
+    return {task: chain for task, chain in routes.items() if chain}
+
+
+class ModelRouter:
+    """Per-task model chains plus latency and token usage recorded per (task, model) route."""
+
+    def __init__(self, routes: Optional[Dict[str, List[str]]] = None):
+        self.routes = routes if routes is not None else load_routes()
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def chain(self, task: Optional[str], default: str) -> List[str]:
+        return list(self.routes.get(task) or [default])
+
+    def record(self, task: Optional[str], model: str, latency: float, usage=None, ok: bool = True):
+        with self._lock:
+            route = self._stats.setdefault((task or "default", model), {
+                "calls": 0, "failures": 0, "latency_total": 0.0, "prompt_tokens": 0, "completion_tokens": 0,
+            })
+            route["calls"] += 1
+            route["latency_total"] += latency
+            if not ok:
+                route["failures"] += 1
+            if usage is not None:
+                route["prompt_tokens"] += getattr(usage, "prompt_tokens", 0) or 0
+                route["completion_tokens"] += getattr(usage, "completion_tokens", 0) or 0
+
+    def stats(self) -> List[dict]:
+        with self._lock:
+            return [
+                {"task": task, "model": model, **route,
+                 "avg_latency": route["latency_total"] / route["calls"] if route["calls"] else 0.0}
+                for (task, model), route in sorted(self._stats.items())
+            ]
+
+
+_default_router = None
+_default_lock = threading.Lock()
+
+def get_default_router() -> ModelRouter:
+    global _default_router
+    with _default_lock:
+        if _default_router is None:
+            _default_router = ModelRouter()
+        return _default_router
@@ -0,0 +1,25 @@
+from pydantic import BaseModel, Field
+from typing import List
+
+# --- DATA STRUCTURES ---
+class ATSEvaluation(BaseModel):
+    score: int
+    missing_keywords: List[str]
+    suggestions: List[str]
+
+class ExperienceItem(BaseModel):
+    role: str = ""
+    company: str = ""
+    duration: str = ""
+    location: str = ""
+    summary_input: str = ""
+    tech_stack: str = ""
+    enhanced_bullets: List[str] = Field(default_factory=list)
+    fingerprint: str = ""  # inputs hash of the last rewrite (see ResumeAgentBase._job_fingerprint)
+
+class ResumeData(BaseModel):
+    full_name: str = ""
+    contact_info: str = ""
+    education: List[dict] = Field(default_factory=list)
+    skills: dict = Field(default_factory=dict)
+    experience: List[ExperienceItem] = Field(default_factory=list)
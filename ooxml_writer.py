@@ -0,0 +1,159 @@
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+from io import BytesIO
+from typing import Iterator, List
+from xml.sax.saxutils import escape
+
+from models import ResumeData
+
+DOCUMENT_PART = "word/document.xml"
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+# --- PARAGRAPH PROPERTIES (same layout as the python-docx renderer) ---
+RIGHT_TAB = '<w:tabs><w:tab w:val="right" w:pos="10800"/></w:tabs>'  # 7.5"
+BOTTOM_BORDER = '<w:pBdr><w:bottom w:val="single" w:sz="6" w:space="1" w:color="000000"/></w:pBdr>'
+
+def _spacing(points: float) -> str:
+    return f'<w:spacing w:after="{int(points * 20)}"/>'
+
+PPR = {
+    "center": '<w:pPr><w:jc w:val="center"/></w:pPr>',
+    "contact": f'<w:pPr>{_spacing(12)}<w:jc w:val="center"/></w:pPr>',
+    "header": f'<w:pPr>{BOTTOM_BORDER}</w:pPr>',
+    "tabbed": f'<w:pPr>{RIGHT_TAB}</w:pPr>',
+    "job_line1": f'<w:pPr>{RIGHT_TAB}{_spacing(0)}</w:pPr>',
+    "bullet": f'<w:pPr><w:pStyle w:val="ListBullet"/>{_spacing(0)}</w:pPr>',
+    "space_0": f'<w:pPr>{_spacing(0)}</w:pPr>',
+    "space_2": f'<w:pPr>{_spacing(2)}</w:pPr>',
+    "space_6": f'<w:pPr>{_spacing(6)}</w:pPr>',
+    "space_8": f'<w:pPr>{_spacing(8)}</w:pPr>',
+}
+
+# Characters XML 1.0 can't carry; pypdf text often has form feeds (\x0c) between pages
+_XML_ILLEGAL_RE = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff\ufffe\uffff]")
+
+def _run(text: str, bold: bool = False, italic: bool = False, size_pt: float = None) -> str:
+    if _XML_ILLEGAL_RE.search(text):
+        # Same error python-docx raises, so both engines reject the same input instead of writing a corrupt file
+        raise ValueError("All strings must be XML compatible: Unicode or ASCII, no NULL bytes or control characters")
+    props = ""
+    if bold:
+        props += "<w:b/>"
+    if italic:
+        props += "<w:i/>"
+    if size_pt:
+        props += f'<w:sz w:val="{int(size_pt * 2)}"/>'
+    parts = []
+    for chunk in re.split(r"(\t|\n|\r)", text):
+        if chunk == "\t":
+            parts.append("<w:tab/>")
+        elif chunk in ("\n", "\r"):
+            parts.append("<w:br/>")
+        elif chunk:
+            space = ' xml:space="preserve"' if chunk != chunk.strip() else ""
+            parts.append(f"<w:t{space}>{escape(chunk)}</w:t>")
+    rpr = f"<w:rPr>{props}</w:rPr>" if props else ""
+    return f"<w:r>{rpr}{''.join(parts)}</w:r>"
+
+def _paragraph(kind: str, *runs: str) -> str:
+    return f"<w:p>{PPR[kind]}{''.join(runs)}</w:p>"
+
+def iter_body(data: ResumeData) -> Iterator[str]:
+    """Yields document.xml body paragraphs for `data`, in layout order."""
+    # HEADER
+    yield _paragraph("center", _run(data.full_name, bold=True, size_pt=16))
+    yield _paragraph("contact", _run(data.contact_info))
+
+    # EDUCATION
+    yield _paragraph("header", _run("EDUCATION", bold=True, size_pt=11))
+    for edu in data.education:
+        yield _paragraph("tabbed", _run(edu.get('school', ''), bold=True), _run(f"\t{edu.get('year', '')}"))
+        degree = edu.get('degree', '')
+        yield _paragraph("space_8", _run(degree) if degree else "")
+
+    # SKILLS
+    yield _paragraph("header", _run("SKILLS", bold=True, size_pt=11))
+    for cat, items in data.skills.items():
+        yield _paragraph("space_0", _run(f"{cat}: ", bold=True), _run(str(items)))
+    yield _paragraph("space_8")
+
+    # EXPERIENCE
+    yield _paragraph("header", _run("WORK EXPERIENCE", bold=True, size_pt=11))
+    for job in data.experience:
+        yield _paragraph("job_line1", _run(job.role, bold=True, size_pt=11), _run(f"\t{job.duration}"))
+        yield _paragraph("space_2", _run(job.company, italic=True), _run(f" | {job.location}"))
+        for bullet in job.enhanced_bullets:
+            yield _paragraph("bullet", _run(bullet) if bullet else "")
+        yield _paragraph("space_6")
+
+# --- PACKAGE ---
+class StaticPackage:
+    """
+    Everything in the .docx except the body, captured once from a styled template:
+    a zip holding every other part, the <w:document> start tag and the section properties.
+    """
+
+    def __init__(self, template_bytes: bytes):
+        prefix = BytesIO()
+        with zipfile.ZipFile(BytesIO(template_bytes)) as src, \
+                zipfile.ZipFile(prefix, "w", zipfile.ZIP_DEFLATED) as dst:
+            for info in src.infolist():
+                if info.filename == DOCUMENT_PART:
+                    document_xml = src.read(info).decode("utf-8")
+                else:
+                    dst.writestr(info, src.read(info))
+        self.prefix = prefix.getvalue()
+        self.document_open = re.search(r"<w:document\b[^>]*>", document_xml).group(0)
+        self.sect_pr = re.search(r"<w:sectPr\b.*</w:sectPr>", document_xml, re.S).group(0)
+
+    def write(self, data: ResumeData) -> bytes:
+        buffer = BytesIO(self.prefix)
+        buffer.seek(0, 2)
+        with zipfile.ZipFile(buffer, "a", zipfile.ZIP_DEFLATED) as zf:
+            with zf.open(DOCUMENT_PART, "w") as part:
+                part.write(b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n')
+                part.write(f"{self.document_open}<w:body>".encode())
+                for paragraph in iter_body(data):
+                    part.write(paragraph.encode())
+                part.write(f"{self.sect_pr}</w:body></w:document>".encode())
+        return buffer.getvalue()
+
+# --- EQUIVALENCE CHECK ---
+def _w(tag: str) -> str:
+    return f"{{{W_NS}}}{tag}"
+
+def layout_signature(docx_bytes: bytes) -> List[tuple]:
+    """Renderer-independent view of the body: per paragraph its formatting and (text, bold, italic, size) runs."""
+    with zipfile.ZipFile(BytesIO(docx_bytes)) as zf:
+        root = ET.fromstring(zf.read(DOCUMENT_PART))
+    signature = []
+    for p in root.find(_w("body")).findall(_w("p")):
+        ppr = p.find(_w("pPr"))
+        def attr(path, name="val"):
+            el = ppr.find(path) if ppr is not None else None
+            return el.get(_w(name)) if el is not None else None
+        tabs = tuple((t.get(_w("val")), t.get(_w("pos"))) for t in p.iter(_w("tab")) if t.get(_w("pos")))
+        runs = []
+        for r in p.findall(_w("r")):
+            text = "".join({_w("tab"): "\t", _w("br"): "\n"}.get(child.tag, child.text or "")
+                           for child in r if child.tag in (_w("t"), _w("tab"), _w("br")))
+            rpr = r.find(_w("rPr"))
+            bold = rpr is not None and rpr.find(_w("b")) is not None
+            italic = rpr is not None and rpr.find(_w("i")) is not None
+            size = rpr.find(_w("sz")).get(_w("val")) if rpr is not None and rpr.find(_w("sz")) is not None else None
+            runs.append((text, bold, italic, size))
+        signature.append((
+            attr(_w("pStyle")), attr(_w("jc")), attr(_w("spacing"), "after"),
+            tabs, attr(f"{_w('pBdr')}/{_w('bottom')}"), tuple(runs),
+        ))
+    return signature
+
+def compare_layouts(expected: bytes, actual: bytes) -> List[str]:
+    """Human-readable differences between two renders (empty list when equivalent)."""
+    a, b = layout_signature(expected), layout_signature(actual)
+    diffs = [f"paragraph count {len(a)} != {len(b)}"] if len(a) != len(b) else []
+    for i, (pa, pb) in enumerate(zip(a, b)):
+        if pa != pb:
+            diffs.append(f"paragraph {i}: {pa} != {pb}")
+    return diffs
@@ -0,0 +1,136 @@
+import re
+from typing import List
+
+from models import ExperienceItem, ResumeData
+
+# --- SPLITTING ---
+SECTION_HEADERS = (
+    "summary", "professional summary", "profile", "objective", "experience", "work experience",
+    "professional experience", "employment", "employment history", "education", "skills",
+    "technical skills", "projects", "certifications", "awards", "publications", "volunteering",
+    "languages", "interests",
+)
+_HEADER_RE = re.compile(r"^\s*(%s)\s*:?\s*$" % "|".join(re.escape(h) for h in SECTION_HEADERS), re.I)
+
+_MONTH = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?"
+_DATE = rf"(?:{_MONTH}\s+)?(?:19|20)\d{{2}}|\d{{1,2}}/(?:19|20)?\d{{2}}"
+DATE_RANGE_RE = re.compile(rf"({_DATE})\s*(?:-|–|—|to)\s*({_DATE}|present|current|now)", re.I)
+
+
+def is_section_header(line: str) -> bool:
+    return bool(_HEADER_RE.match(line))
+
+
+def _blocks(lines: List[str]):
+    """Splits lines into (section, block_lines) at section headers and at the start of each dated job."""
+    section = ""
+    block = []
+    for line in lines:
+        if is_section_header(line):
+            if block:
+                yield section, block
+            section, block = line.strip(), [line]
+            continue
+        if DATE_RANGE_RE.search(line) and len(block) > 1:
+            # Keep a short title line ("Engineer @ Acme") with the dates that follow it
+            carry = [block.pop()] if len(block[-1].strip()) < 80 and block[-1].strip() else []
+            yield section, block
+            block = carry
+        block.append(line)
+    if block:
+        yield section, block
+
+
+def split_resume_text(raw_text: str, max_chars: int) -> List[str]:
+    """
+    Splits a resume into chunks of at most ~max_chars on section and job boundaries.
+    A chunk that starts inside a section is prefixed with "<SECTION> (continued)" for context.
+    """
+    chunks = []
+    current = ""
+    for section, block in _blocks(raw_text.splitlines()):
+        text = "\n".join(block) + "\n"
+        # Hard-split oversized blocks on line boundaries
+        pieces = []
+        while len(text) > max_chars:
+            cut = text.rfind("\n", 0, max_chars)
+            cut = cut if cut > 0 else max_chars
+            pieces.append(text[:cut + 1])
+            text = text[cut + 1:]
+        pieces.append(text)
+        for piece in pieces:
+            if current and len(current) + len(piece) > max_chars:
+                chunks.append(current)
+                current = ""
+            if not current and section and not piece.lstrip().startswith(section):
+                current = f"{section} (continued)\n"
+            current += piece
+    if current.strip():
+        chunks.append(current)
+    return chunks
+
+# --- MERGING ---
+def _key(*values) -> str:
+    return "|".join(re.sub(r"[^a-z0-9]+", "", str(v).lower()) for v in values)
+
+
+def _split_items(value) -> List[str]:
+    if isinstance(value, (list, tuple)):
+        return [str(v).strip() for v in value if str(v).strip()]
+    return [item.strip() for item in str(value).split(",") if item.strip()]
+
+
+def merge_skills(skill_dicts: List[dict]) -> dict:
+    """Merges skills dicts; categories match case-insensitively and items are de-duplicated in order."""
+    merged = {}
+    names = {}
+    for skills in skill_dicts:
+        for category, items in (skills or {}).items():
+            name = names.setdefault(category.strip().lower(), category)
+            bucket = merged.setdefault(name, [])
+            seen = {_key(item) for item in bucket}
+            for item in _split_items(items):
+                if _key(item) not in seen:
+                    bucket.append(item)
+                    seen.add(_key(item))
+    return {category: ", ".join(items) for category, items in merged.items()}
+
+
+def _merge_job(target: ExperienceItem, extra: ExperienceItem):
+    for field in ("role", "company", "duration", "location"):
+        if not getattr(target, field) and getattr(extra, field):
+            setattr(target, field, getattr(extra, field))
+    stack = _split_items(target.tech_stack)
+    known = {_key(item) for item in stack}
+    stack += [item for item in _split_items(extra.tech_stack) if _key(item) not in known]
+    target.tech_stack = ", ".join(stack)
+    if extra.summary_input and extra.summary_input not in target.summary_input:
+        target.summary_input = f"{target.summary_input}\n{extra.summary_input}".strip()
+    target.enhanced_bullets += [b for b in extra.enhanced_bullets if b not in target.enhanced_bullets]
+
+
+def merge_resume_parts(parts: List[ResumeData]) -> ResumeData:
+    """Reduces per-chunk parses into one ResumeData without dropping or duplicating entries."""
+    merged = ResumeData()
+    education_keys = set()
+    jobs = {}
+    for part in parts:
+        merged.full_name = merged.full_name or part.full_name
+        merged.contact_info = merged.contact_info or part.contact_info
+        for edu in part.education:
+            key = _key(edu.get("school", ""), edu.get("degree", ""))
+            if key.strip("|") and key not in education_keys:
+                education_keys.add(key)
+                merged.education.append(edu)
+        for job in part.experience:
+            key = _key(job.role, job.company)
+            # A job cut across chunks often comes back without its company in the second half
+            if key not in jobs and not job.company and merged.experience and _key(merged.experience[-1].role) == _key(job.role):
+                key = _key(merged.experience[-1].role, merged.experience[-1].company)
+            if key in jobs:
+                _merge_job(jobs[key], job)
+            elif key.strip("|") or job.summary_input:
+                jobs[key] = job.model_copy(deep=True)
+                merged.experience.append(jobs[key])
+    merged.skills = merge_skills([part.skills for part in parts])
+    return merged
@@ -0,0 +1,239 @@
+import re
+from typing import Dict, List
+
+import ats_engine
+from models import ExperienceItem, ResumeData
+from resume_chunking import DATE_RANGE_RE, is_section_header
+
+CONFIDENCE_THRESHOLD = 0.75
+FIELDS = ("full_name", "contact_info", "education", "skills", "experience")
+
+# --- PATTERNS ---
+EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+PHONE_RE = re.compile(r"(?:\+?\d{1,3}[\s.-]?)?\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}")
+LINKEDIN_RE = re.compile(r"(?:https?://)?(?:www\.)?linkedin\.com/in/[\w-]+/?", re.I)
+YEAR_RE = re.compile(r"\b(?:19|20)\d{2}\b")
+DEGREE_RE = re.compile(
+    r"\b(?:B\.?\s?S\.?c?|B\.?\s?A\.?|B\.?\s?Tech|B\.?\s?E\.?|M\.?\s?S\.?c?|M\.?\s?A\.?|M\.?\s?Tech|MBA|Ph\.?\s?D\.?|"
+    r"Bachelor'?s?|Master'?s?|Associate'?s?|Doctor(?:ate)?|Diploma)\b", re.I)
+SCHOOL_RE = re.compile(r"\b(?:University|College|Institute|School|Academy|Polytechnic)\b", re.I)
+BULLET_RE = re.compile(r"^\s*(?:[-*•●▪◦–]|\d+[.)])\s*")
+TITLE_SPLIT_RE = re.compile(r"\s+(?:@|at|\||–|—|-)\s+|,\s+")
+
+SECTION_ALIASES = {
+    "experience": ("experience", "employment"),
+    "education": ("education",),
+    "skills": ("skills",),
+}
+
+def _canonical_section(header: str) -> str:
+    header = header.lower()
+    for name, words in SECTION_ALIASES.items():
+        if any(word in header for word in words):
+            return name
+    return header.strip(" :")
+
+# --- RESULT ---
+class LocalParse:
+    """Heuristic parse plus a 0-1 confidence per ResumeData field and the raw text of each section."""
+
+    def __init__(self, data: ResumeData, confidence: Dict[str, float], sections: Dict[str, str], raw_text: str):
+        self.data = data
+        self.confidence = confidence
+        self.sections = sections
+        self.raw_text = raw_text
+
+    def low_confidence(self, threshold: float = CONFIDENCE_THRESHOLD) -> List[str]:
+        return [field for field in FIELDS if self.confidence.get(field, 0.0) < threshold]
+
+    def text_for(self, fields: List[str]) -> str:
+        """Only the parts of the resume the given fields come from; the whole text if one can't be located."""
+        parts = []
+        if "full_name" in fields or "contact_info" in fields:
+            parts.append(self.sections.get("header", ""))
+        for field in ("education", "skills", "experience"):
+            if field in fields:
+                if not self.sections.get(field):
+                    return self.raw_text
+                parts.append(self.sections[field])
+        text = "\n".join(part for part in parts if part)
+        return text if text.strip() else self.raw_text
+
+    def merged_with(self, llm_data: ResumeData, fields: List[str]) -> ResumeData:
+        """Local result with `fields` taken from the LLM parse (where it returned something)."""
+        data = self.data.model_copy(deep=True)
+        for field in fields:
+            value = getattr(llm_data, field)
+            if value:
+                setattr(data, field, value)
+        return data
+
+# --- PARSING ---
+def _split_sections(lines: List[str]) -> Dict[str, List[str]]:
+    sections = {"header": []}
+    current = "header"
+    for line in lines:
+        if is_section_header(line):
+            current = _canonical_section(line)
+            sections.setdefault(current, []).append(line)
+            continue
+        sections.setdefault(current, []).append(line)
+    return sections
+
+
+def _parse_name(header: List[str]):
+    for line in header[:3]:
+        words = line.split()
+        if (2 <= len(words) <= 4 and not any(ch.isdigit() for ch in line) and "@" not in line
+                and all(w[0].isupper() for w in words if w[0].isalpha())):
+            return line.strip(), 0.9
+    return (header[0].strip(), 0.3) if header else ("", 0.0)
+
+
+def _parse_contact(header: List[str]):
+    text = " ".join(header)
+    found = []
+    for pattern in (PHONE_RE, EMAIL_RE, LINKEDIN_RE):
+        match = pattern.search(text)
+        if match:
+            found.append(match.group(0).strip())
+    if EMAIL_RE.search(text):
+        return " | ".join(found), 0.9
+    return " | ".join(found), 0.5 if found else 0.0
+
+
+def _parse_skills(lines: List[str]):
+    skills = {}
+    loose = []
+    for line in lines:
+        line = BULLET_RE.sub("", line).strip()
+        if ":" in line:
+            category, items = line.split(":", 1)
+            if category.strip() and items.strip() and len(category) < 40:
+                skills[category.strip()] = items.strip()
+                continue
+        if line:
+            loose.append(line)
+    if loose:
+        skills["Skills"] = ", ".join(loose)
+    if not skills:
+        return {}, 0.0
+    return skills, 0.9 if not loose else 0.6
+
+
+def _parse_education(lines: List[str]):
+    entries = []
+    current = None
+    for line in lines:
+        line = BULLET_RE.sub("", line).strip()
+        if not line:
+            continue
+        year = YEAR_RE.findall(line)
+        if SCHOOL_RE.search(line) and (current is None or current["school"]):
+            current = {"school": "", "degree": "", "year": ""}
+            entries.append(current)
+        if current is None:
+            current = {"school": "", "degree": "", "year": ""}
+            entries.append(current)
+        for part in re.split(r"\s*[|,;–—]\s*|\s+-\s+", line):
+            if not part or YEAR_RE.fullmatch(part.strip()):
+                continue
+            if SCHOOL_RE.search(part) and not current["school"]:
+                current["school"] = part.strip()
+            elif DEGREE_RE.search(part) and not current["degree"]:
+                current["degree"] = part.strip()
+        if year and not current["year"]:
+            current["year"] = year[-1]
+    if not entries:
+        return [], 0.0
+    complete = all(e["school"] and e["degree"] for e in entries)
+    return entries, 0.85 if complete else 0.4
+
+
+def _tech_stack(text: str) -> str:
+    """Known skills (ats_engine.KNOWN_SKILLS) named in a job's text, longest match first, in order of mention."""
+    tokens = ats_engine.tokenize(text)
+    found = []
+    i = 0
+    while i < len(tokens):
+        for n in range(ats_engine.MAX_NGRAM, 0, -1):
+            phrase = " ".join(tokens[i:i + n])
+            if i + n <= len(tokens) and phrase in ats_engine.KNOWN_SKILLS:
+                break
+        else:
+            i += 1
+            continue
+        # Keep the resume's own spelling; one- and two-letter names (C, R, Go) only count when capitalised
+        match = re.search(r"(?<![\w+#.])" + re.escape(phrase) + r"(?![\w+#])", text, re.I)
+        if match and len(phrase) <= 2 and match.group(0).islower():
+            match = None
+        if phrase not in (name.lower() for name in found) and (match or len(phrase) > 2):
+            found.append(match.group(0) if match else phrase)
+        i += n
+    return ", ".join(found)
+
+
+def _parse_experience(lines: List[str]):
+    jobs = []
+    pending = []
+    for line in lines:
+        stripped = line.strip()
+        if not stripped:
+            continue
+        match = DATE_RANGE_RE.search(stripped)
+        if match:
+            # The title line normally sits right above (or on) the date line
+            title_line = stripped[:match.start()].strip(" |,–—-")
+            if not title_line and pending and not BULLET_RE.match(pending[-1]):
+                title_line = pending.pop().strip()
+            if jobs and pending:
+                jobs[-1]["body"].extend(pending)
+            pending = []
+            parts = [p.strip() for p in TITLE_SPLIT_RE.split(title_line) if p.strip()]
+            location = stripped[match.end():].strip(" |,–—-")
+            jobs.append({
+                "role": parts[0] if parts else "",
+                "company": parts[1] if len(parts) > 1 else "",
+                "location": location or (parts[2] if len(parts) > 2 else ""),
+                "duration": match.group(0),
+                "body": [],
+            })
+        else:
+            pending.append(stripped)
+    if jobs:
+        jobs[-1]["body"].extend(pending)
+
+    items = []
+    for job in jobs:
+        summary = "\n".join(BULLET_RE.sub("", line) for line in job["body"])
+        items.append(ExperienceItem(
+            role=job["role"], company=job["company"], duration=job["duration"], location=job["location"],
+            tech_stack=_tech_stack(summary), summary_input=summary,
+        ))
+    if not items:
+        return [], 0.0
+    if not all(item.role and item.company and item.summary_input for item in items):
+        return items, 0.4
+    # A job with no recognisable stack is left to the LLM, which can still infer one
+    return items, 0.8 if all(item.tech_stack for item in items) else 0.6
+
+
+def heuristic_parse(raw_text: str) -> LocalParse:
+    """Rule-based ResumeData from extracted text: name/contact lines, section headers and date ranges."""
+    lines = [line for line in raw_text.splitlines() if line.strip()]
+    sections = _split_sections(lines)
+    header = sections.get("header", [])
+
+    full_name, name_conf = _parse_name(header)
+    contact_info, contact_conf = _parse_contact(header)
+    education, edu_conf = _parse_education(sections.get("education", [])[1:])
+    skills, skills_conf = _parse_skills(sections.get("skills", [])[1:])
+    experience, exp_conf = _parse_experience(sections.get("experience", [])[1:])
+
+    data = ResumeData(full_name=full_name, contact_info=contact_info, education=education,
+                      skills=skills, experience=experience)
+    confidence = {
+        "full_name": name_conf, "contact_info": contact_conf, "education": edu_conf,
+        "skills": skills_conf, "experience": exp_conf,
+    }
+    return LocalParse(data, confidence, {name: "\n".join(body) for name, body in sections.items()}, raw_text)
@@ -0,0 +1,47 @@
+import os
+import re
+import json
+import hashlib
+from functools import lru_cache
+from typing import Tuple
+
+ASSET_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets")
+
+# --- BUILD ---
+def minify_css(css: str) -> str:
+    """Drops comments and insignificant whitespace. Descendant-selector spaces are kept."""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css)
+    css = re.sub(r":\s+", ":", css)
+    return css.replace(";}", "}").strip()
+
+
+@lru_cache(maxsize=None)
+def load_css(name: str) -> Tuple[str, str]:
+    """(minified CSS, content hash) of assets/<name>.css, built once per process."""
+    with open(os.path.join(ASSET_DIR, f"{name}.css"), encoding="utf-8") as f:
+        css = minify_css(f.read())
+    return css, hashlib.sha256(css.encode()).hexdigest()[:12]
+
+# --- INJECTION ---
+def css_injector(css: str, digest: str, scope: str) -> str:
+    """
+    Script for a zero-height components.html frame that installs the stylesheet in the parent
+    page's <head> as <style id="resumeai-css-<digest>">. Styles in <head> outlive reruns, so the
+    app only sends them once per session. Other styles of the same scope are removed, which is
+    how page-specific CSS is swapped (an empty `css` just clears the scope).
+    """
+    style_id = f"resumeai-css-{digest}"
+    payload = json.dumps(css).replace("</", "<\\/")
+    return f"""<script>
+const doc = window.parent.document;
+doc.querySelectorAll('style[data-resumeai-scope="{scope}"]').forEach(el => {{ if (el.id !== "{style_id}") el.remove(); }});
+if ({payload} && !doc.getElementById("{style_id}")) {{
+    const el = doc.createElement("style");
+    el.id = "{style_id}";
+    el.dataset.resumeaiScope = "{scope}";
+    el.textContent = {payload};
+    doc.head.appendChild(el);
+}}
+</script>"""
@@ -0,0 +1,70 @@
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Iterator, List, Optional
+
+from pydantic import BaseModel
+
+import backend_ai as backend
+from jd_library import jd_hash
+from models import ATSEvaluation, ResumeData
+
+# --- RESULTS ---
+class TailoredResume(BaseModel):
+    index: int  # position of the JD in the input list
+    jd_text: str
+    path: str = ""
+    docx_bytes: bytes = b""  # set when rendering in memory (out_dir=None)
+    evaluation: Optional[ATSEvaluation] = None
+    error: str = ""
+
+# --- JD GROUPING ---
+def group_jds(jd_texts: List[str]) -> List[List[int]]:
+    """Indexes of JDs that only differ in formatting, in first-seen order."""
+    groups = {}
+    for i, jd_text in enumerate(jd_texts):
+        groups.setdefault(jd_hash(jd_text), []).append(i)
+    return list(groups.values())
+
+# --- PIPELINE ---
+def _tailor_one(agent, resume: ResumeData, jd_text: str, target_role: str, tone: str,
+                path: Optional[str], audit_mode: str):
+    # Each JD gets its own copy; rewrite_all_jobs mutates the jobs it is given
+    tailored = resume.model_copy(deep=True)
+    tailored.experience = agent.rewrite_all_jobs(tailored.experience, target_role, jd_text, tone)
+    rendered = backend.create_styled_resume(tailored, filename=path)
+    evaluation = agent.audit_resume(tailored, jd_text, mode=audit_mode)
+    return rendered, evaluation
+
+
+def tailor_resume_batch(agent, resume: ResumeData, jd_texts: List[str], target_role: str,
+                        tone: str = "Standard", max_workers: int = 4, out_dir: Optional[str] = None,
+                        audit_mode: str = "hybrid") -> Iterator[TailoredResume]:
+    """
+    Runs rewrite -> render -> audit for every JD on a bounded thread pool and yields each
+    TailoredResume as soon as it is finished (completion order, not input order).
+    JDs that differ only in formatting are processed once and share the resulting file and score.
+    With `out_dir` set, each DOCX is saved there; otherwise it is returned in memory as `docx_bytes`.
+    """
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    groups = group_jds(jd_texts)
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(groups) or 1))) as pool:
+        futures = {}
+        for group in groups:
+            first = group[0]
+            path = os.path.join(out_dir, f"Resume_{first + 1:02d}.docx") if out_dir else None
+            future = pool.submit(_tailor_one, agent, resume, jd_texts[first], target_role, tone, path, audit_mode)
+            futures[future] = group
+
+        for future in as_completed(futures):
+            group = futures[future]
+            try:
+                rendered, evaluation = future.result()
+                error = ""
+            except Exception as e:
+                rendered, evaluation, error = None, None, str(e)
+            path = rendered if isinstance(rendered, str) else ""
+            docx_bytes = rendered if isinstance(rendered, bytes) else b""
+            for i in group:
+                yield TailoredResume(index=i, jd_text=jd_texts[i], path=path, docx_bytes=docx_bytes,
+                                     evaluation=evaluation, error=error)